@@ -1,3 +1,4 @@
 from displaying.display import  GraphDisplayer
 from displaying.adapter import *
-from displaying.layouts import LayoutEngine, SpringLayoutEngine, CircularLayoutEngine, ForceDirectedLayoutEngine
\ No newline at end of file
+from displaying.layouts import LayoutEngine, SpringLayoutEngine, CircularLayoutEngine, ForceDirectedLayoutEngine
+from displaying.profiling import DisplayProfiler, DisplayStats
\ No newline at end of file
@@ -0,0 +1,11 @@
+'''
+    Benchmark suite
+
+    Run from the TypeToGraph directory (same as app.py):
+
+        python -m benchmarks --output bench.json
+        python -m benchmarks --sizes 100 1000 --compare bench.json
+
+    Every case is timed with time.perf_counter and (optionally) run once more under
+    tracemalloc for peak memory. Results are written as JSON so runs can be diffed.
+'''
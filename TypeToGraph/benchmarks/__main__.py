@@ -0,0 +1,54 @@
+import argparse
+import json
+
+from benchmarks.suite import (
+    DEFAULT_BUDGET, DEFAULT_SIZES, FAMILIES,
+    compare, default_cases, run_suite, to_json_dict
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks",
+                                    description="Benchmark trees, adapters, layout engines and rendering")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    parser.add_argument("--families", nargs="+", choices=FAMILIES, default=FAMILIES)
+    parser.add_argument("--cases", nargs="+", default=None,
+                        help="only run cases whose name contains one of these strings")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET,
+                        help="skip cases whose estimated cost is above this")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", default=None, help="previous results file to compare against")
+    args = parser.parse_args()
+
+    cases = default_cases()
+    if args.cases:
+        cases = [case for case in cases if any(part in case.name for part in args.cases)]
+
+    results = run_suite(
+        sizes=args.sizes, families=args.families, cases=cases, repeat=max(1, args.repeat),
+        budget=args.budget, measure_memory=not args.no_memory, seed=args.seed,
+    )
+
+    settings = {
+        "sizes": args.sizes, "families": args.families, "cases": [case.name for case in cases],
+        "repeat": args.repeat, "budget": args.budget, "seed": args.seed,
+    }
+    report = to_json_dict(results, settings)
+
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Wrote {len(results)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            previous = json.load(f)
+        print(f"\nMedian time vs {args.compare} (new / old):")
+        for line in compare(previous, report):
+            print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+import random
+import sys
+import types
+
+from graph.tree import BinaryTree, DateBasedNoteTree
+
+
+'''
+    Tree generators
+
+    Binary trees are described by their insertion order so the insert benchmark can
+    rebuild them from scratch:
+        balanced -> midpoints first (height ~ log2 n)
+        skewed   -> ascending values (height = n, a linked list)
+        random   -> shuffled values (height ~ 3 ln n on average)
+'''
+
+
+def balanced_values(n: int) -> List[int]:
+    '''Insertion order that produces a perfectly balanced BST'''
+    order = []
+    ranges = deque([(0, n - 1)])
+
+    # breadth first over ranges so no recursion is needed for large n
+    while ranges:
+        lo, hi = ranges.popleft()
+        if lo > hi:
+            continue
+        mid = (lo + hi) // 2
+        order.append(mid)
+        ranges.append((lo, mid - 1))
+        ranges.append((mid + 1, hi))
+
+    return order
+
+
+def skewed_values(n: int) -> List[int]:
+    return list(range(n))
+
+
+def random_values(n: int, seed: int = 0) -> List[int]:
+    values = list(range(n))
+    random.Random(seed).shuffle(values)
+    return values
+
+
+def build_binary_tree(values: List[int]) -> BinaryTree:
+    if not values:
+        raise ValueError("Need at least one value to build a tree")
+
+    tree = BinaryTree(values[0])
+    for value in values[1:]:
+        tree.insert(value)
+    return tree
+
+
+def tree_height(tree: BinaryTree) -> int:
+    '''Number of edges on the longest root -> leaf path (iterative)'''
+    if tree.root is None:
+        return -1
+
+    height = 0
+    stack = [(tree.root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        height = max(height, depth)
+        if node.left is not None:
+            stack.append((node.left, depth + 1))
+        if node.right is not None:
+            stack.append((node.right, depth + 1))
+    return height
+
+
+def note_archive(n: int, seed: int = 0, years: int = 10, nesting: float = 0.0) -> DateBasedNoteTree:
+    '''
+    Synthetic archive with n notes spread over the last `years` years.
+    With nesting > 0 that fraction of notes becomes a child of a random earlier note.
+    '''
+    rng = random.Random(seed)
+    tree = DateBasedNoteTree()
+    end = datetime(2024, 12, 31)
+    span_seconds = years * 365 * 24 * 3600
+
+    added = []
+    for i in range(n):
+        created_at = end - timedelta(seconds=rng.randrange(span_seconds))
+        note = tree.add_note(f"Note {i}", f"Synthetic note {i}\nbody", created_at=created_at)
+        if added and rng.random() < nesting:
+            added[rng.randrange(len(added))].add_note_as_child(note)
+        added.append(note)
+
+    return tree
+
+
+# how a synthetic field refers to another model
+_FIELD_SHAPES = ["{}", "Optional[{}]", "List[{}]", "Dict[str, {}]"]
+
+
+def model_module(n: int, seed: int = 0, fields: int = 4) -> types.ModuleType:
+    '''
+    Module with n dataclasses (Model0 ... Model{n-1}), each with `fields` string annotated
+    fields pointing at random other models, so forward references and cycles are common.
+    Registered in sys.modules because dataclass and get_type_hints resolve names through it.
+    '''
+    rng = random.Random(seed)
+    module = types.ModuleType(f"benchmarks.synthetic_models_{n}_{seed}")
+    module.__dict__.update(Optional=Optional, List=List, Dict=Dict)
+    sys.modules[module.__name__] = module
+
+    for i in range(n):
+        annotations = {f"field{j}": rng.choice(_FIELD_SHAPES).format(f"Model{rng.randrange(n)}")
+                    for j in range(fields)}
+        cls = type(f"Model{i}", (), {'__annotations__': annotations, '__module__': module.__name__})
+        setattr(module, cls.__name__, dataclass(cls))
+
+    return module
@@ -0,0 +1,392 @@
+import matplotlib
+matplotlib.use("Agg")  # headless, must happen before pyplot is imported
+
+import matplotlib.pyplot as plt
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+import math
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+from displaying.adapter import (
+    BinaryTreeAdapter, DateBasedTreeAdapter, NoteHierarchyAdapter, TypeGraphAdapter
+)
+from displaying.display import GraphDisplayer
+from displaying.layouts import (
+    LayoutEngine, SpringLayoutEngine, HierarchicalLayoutEngine,
+    CircularLayoutEngine, ForceDirectedLayoutEngine
+)
+from graph import tree as graph_tree
+from graph.tree import TypeGraphTree
+from benchmarks import generators
+
+
+DEFAULT_SIZES: List[int] = [10**2, 10**3, 10**4, 10**5, 10**6]
+BINARY_FAMILIES: List[str] = ['balanced', 'skewed', 'random']
+NOTE_FAMILIES: List[str] = ['notes', 'nested_notes']
+TYPE_FAMILIES: List[str] = ['models']
+FAMILIES: List[str] = BINARY_FAMILIES + NOTE_FAMILIES + TYPE_FAMILIES
+
+# fraction of notes filed under another note in the nested_notes family
+NESTING: float = 0.5
+
+# rough "python level operations" budget per case; anything estimated above it is
+# recorded as skipped instead of hanging the run
+DEFAULT_BUDGET: float = 1e8
+
+# creating one synthetic dataclass (~0.8ms) and introspecting it (~0.3ms), in the same
+# units as the budget
+MODEL_BUILD_COST: float = 10_000
+MODEL_INTROSPECT_COST: float = 4_000
+
+
+@dataclass
+class Workload:
+    '''A generated tree plus what the cost estimates need to know about it'''
+    family: str
+    size: int
+    values: Optional[List[int]]  # insertion order (binary families only)
+    tree: Any
+    height: int
+    module: Any = None  # generated model classes (model families only)
+
+
+@dataclass
+class BenchmarkCase:
+    '''
+    prepare(workload) -> ctx runs untimed, run(ctx) is the timed part.
+    cost(workload) estimates the work so infeasible sizes can be skipped.
+    '''
+    name: str
+    families: List[str]
+    prepare: Callable[[Workload], Any]
+    run: Callable[[Any], Any]
+    cost: Callable[[Workload], float]
+
+
+@dataclass
+class BenchmarkResult:
+    case: str
+    family: str
+    size: int
+    status: str  # ok | skipped | error
+    times_s: List[float] = field(default_factory=list)
+    min_s: Optional[float] = None
+    median_s: Optional[float] = None
+    peak_bytes: Optional[int] = None
+    reason: Optional[str] = None
+
+
+def build_cost(family: str, size: int) -> float:
+    '''Every insert walks the tree's depth: ~n^2/2 for skewed trees, ~n log n otherwise'''
+    if family in NOTE_FAMILIES:
+        return size
+    if family in TYPE_FAMILIES:
+        return size * (MODEL_BUILD_COST + MODEL_INTROSPECT_COST)
+    if family == 'skewed':
+        return size * size / 2
+    return size * 3 * math.log(max(size, 2))
+
+
+def build_workload(family: str, size: int, seed: int = 0) -> Workload:
+    if family in NOTE_FAMILIES:
+        nesting = NESTING if family == 'nested_notes' else 0.0
+        return Workload(family, size, None, generators.note_archive(size, seed, nesting=nesting), 2)
+
+    if family in TYPE_FAMILIES:
+        module = generators.model_module(size, seed)
+        tree = TypeGraphTree.from_module(module)
+        return Workload(family, size, None, tree, len(tree.get_display_values()) - 1, module)
+
+    if family == 'balanced':
+        values = generators.balanced_values(size)
+    elif family == 'skewed':
+        values = generators.skewed_values(size)
+    elif family == 'random':
+        values = generators.random_values(size, seed)
+    else:
+        raise ValueError(f"Unknown family {family}. Available: {FAMILIES}")
+
+    tree = generators.build_binary_tree(values)
+    return Workload(family, size, values, tree, generators.tree_height(tree))
+
+
+# --- cost estimates -------------------------------------------------------------
+
+def _pow2(exponent: int) -> float:
+    # deep (skewed) trees would overflow a float, anything this large is over budget anyway
+    return 2.0 ** exponent if exponent < 1000 else math.inf
+
+
+def _level_slots(w: Workload) -> float:
+    '''BinaryTree.get_display_values pads missing children with None: 2**(h+1) slots'''
+    if w.family not in BINARY_FAMILIES:
+        return w.size
+    return _pow2(w.height + 1)
+
+
+def _adapter_cost(w: Workload) -> float:
+    if w.family not in BINARY_FAMILIES:
+        return w.size
+    # _find_parent_id scans the whole previous (padded) level for every node
+    return _level_slots(w) + w.size * _pow2(w.height)
+
+
+def _display_nodes(w: Workload):
+    if w.family in NOTE_FAMILIES:
+        adapter = NoteHierarchyAdapter() if w.family == 'nested_notes' else DateBasedTreeAdapter()
+    elif w.family in TYPE_FAMILIES:
+        adapter = TypeGraphAdapter()
+    else:
+        adapter = BinaryTreeAdapter()
+    return adapter.to_display_nodes(w.tree)
+
+
+# --- timed bodies ---------------------------------------------------------------
+
+def _build_type_graph(module) -> TypeGraphTree:
+    # cold: without this every repeat after the first would hit the shared hints cache
+    graph_tree._hints_cache.clear()
+    return TypeGraphTree.from_module(module)
+
+
+def _render(ctx) -> None:
+    displayer, nodes, positions = ctx
+    displayer.current_nodes = nodes
+    displayer.current_positions = positions
+
+    displayer._static_display()
+
+    fig = displayer.fig
+    if fig is not None:
+        fig.canvas.draw()  # actually rasterize
+        plt.close(fig)
+
+
+def _layout_case(name: str, engine: LayoutEngine, cost: Callable[[int], float]) -> BenchmarkCase:
+    return BenchmarkCase(
+        name=f"layout.{name}",
+        families=FAMILIES,
+        prepare=lambda w: _display_nodes(w),
+        run=engine.calculate_positions,
+        cost=lambda w: _adapter_cost(w) + cost(w.size),
+    )
+
+
+def default_cases() -> List[BenchmarkCase]:
+    spring = SpringLayoutEngine(seed=0)
+    force = ForceDirectedLayoutEngine()
+    hierarchical = HierarchicalLayoutEngine()
+
+    return [
+        BenchmarkCase(
+            name="tree.insert",
+            families=BINARY_FAMILIES,
+            prepare=lambda w: w.values,
+            run=generators.build_binary_tree,
+            cost=lambda w: w.size * (w.height + 1),
+        ),
+        BenchmarkCase(
+            name="tree.add_note",
+            families=['notes'],
+            prepare=lambda w: w.size,
+            run=generators.note_archive,
+            cost=lambda w: w.size,
+        ),
+        BenchmarkCase(
+            name="tree.TypeGraphTree",
+            families=TYPE_FAMILIES,
+            prepare=lambda w: w.module,
+            run=_build_type_graph,
+            cost=lambda w: w.size * MODEL_INTROSPECT_COST,
+        ),
+        BenchmarkCase(
+            name="tree.get_display_values",
+            families=FAMILIES,
+            prepare=lambda w: w.tree,
+            run=lambda tree: tree.get_display_values(),
+            cost=_level_slots,
+        ),
+        BenchmarkCase(
+            name="adapter.BinaryTreeAdapter",
+            families=BINARY_FAMILIES,
+            prepare=lambda w: w.tree,
+            run=BinaryTreeAdapter().to_display_nodes,
+            cost=_adapter_cost,
+        ),
+        BenchmarkCase(
+            name="adapter.DateBasedTreeAdapter",
+            families=NOTE_FAMILIES,
+            prepare=lambda w: w.tree,
+            run=DateBasedTreeAdapter().to_display_nodes,
+            cost=_adapter_cost,
+        ),
+        BenchmarkCase(
+            name="adapter.NoteHierarchyAdapter",
+            families=NOTE_FAMILIES,
+            prepare=lambda w: w.tree,
+            run=NoteHierarchyAdapter().to_display_nodes,
+            cost=_adapter_cost,
+        ),
+        # the spring engine vectorises the O(n^2) step with numpy, the force engine is pure python
+        BenchmarkCase(
+            name="adapter.TypeGraphAdapter",
+            families=TYPE_FAMILIES,
+            prepare=lambda w: w.tree,
+            run=TypeGraphAdapter().to_display_nodes,
+            cost=_adapter_cost,
+        ),
+        _layout_case("SpringLayoutEngine", spring, lambda n: n * n * spring.iterations),
+        _layout_case("HierarchicalLayoutEngine", hierarchical, lambda n: n),
+        _layout_case("CircularLayoutEngine", CircularLayoutEngine(), lambda n: n),
+        _layout_case("ForceDirectedLayoutEngine", force,
+                     lambda n: 10 * n * n * max(force.iterations, force.iterations_per_node * n)),
+        BenchmarkCase(
+            name="render.agg",
+            families=FAMILIES,
+            prepare=lambda w: (GraphDisplayer(hierarchical), *_with_positions(_display_nodes(w), hierarchical)),
+            run=_render,
+            # every node costs a scatter point, a Line2D and a Text artist
+            cost=lambda w: _adapter_cost(w) + 10_000 * w.size,
+        ),
+    ]
+
+
+def _with_positions(nodes, engine: LayoutEngine):
+    return nodes, engine.calculate_positions(nodes)
+
+
+# --- runner ---------------------------------------------------------------------
+
+def _time_case(case: BenchmarkCase, ctx: Any, repeat: int, measure_memory: bool) -> BenchmarkResult:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        case.run(ctx)
+        times.append(time.perf_counter() - start)
+
+    peak = None
+    if measure_memory:
+        # separate pass: tracemalloc slows allocation heavy code down a lot
+        tracemalloc.start()
+        try:
+            case.run(ctx)
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    return BenchmarkResult(
+        case=case.name, family="", size=0, status="ok",
+        times_s=times, min_s=min(times), median_s=statistics.median(times),
+        peak_bytes=peak,
+    )
+
+
+def run_suite(sizes: Optional[List[int]] = None, families: Optional[List[str]] = None,
+            cases: Optional[List[BenchmarkCase]] = None, repeat: int = 3,
+            budget: float = DEFAULT_BUDGET, measure_memory: bool = True,
+            seed: int = 0, log: Callable[[str], None] = print) -> List[BenchmarkResult]:
+    sizes = sizes or DEFAULT_SIZES
+    families = families or FAMILIES
+    cases = cases if cases is not None else default_cases()
+    results: List[BenchmarkResult] = []
+
+    for family in families:
+        for size in sizes:
+            family_cases = [case for case in cases if family in case.families]
+            if not family_cases:
+                continue
+
+            estimate = build_cost(family, size)
+            if estimate > budget:
+                # e.g. skewed trees: building one is already quadratic
+                for case in family_cases:
+                    reason = f"building tree: estimated cost {estimate:.2e} > budget {budget:.2e}"
+                    results.append(BenchmarkResult(case.name, family, size, "skipped", reason=reason))
+                log(f"{family:>9} n={size:<8} skipped, building the tree exceeds the budget")
+                continue
+
+            try:
+                workload = build_workload(family, size, seed)
+            except MemoryError as e:
+                for case in family_cases:
+                    results.append(BenchmarkResult(case.name, family, size, "error",
+                                                reason=f"building tree: {type(e).__name__}"))
+                log(f"{family:>9} n={size:<8} could not build tree ({type(e).__name__})")
+                continue
+
+            for case in family_cases:
+                result = _run_one(case, workload, repeat, budget, measure_memory)
+                results.append(result)
+                log(_format_result(result))
+
+    return results
+
+
+def _run_one(case: BenchmarkCase, workload: Workload, repeat: int,
+            budget: float, measure_memory: bool) -> BenchmarkResult:
+    estimate = case.cost(workload)
+    if estimate > budget:
+        return BenchmarkResult(case.name, workload.family, workload.size, "skipped",
+                            reason=f"estimated cost {estimate:.2e} > budget {budget:.2e}")
+
+    try:
+        ctx = case.prepare(workload)
+        result = _time_case(case, ctx, repeat, measure_memory)
+    except Exception as e:
+        return BenchmarkResult(case.name, workload.family, workload.size, "error",
+                            reason=f"{type(e).__name__}: {e}")
+
+    result.family = workload.family
+    result.size = workload.size
+    return result
+
+
+def _format_result(result: BenchmarkResult) -> str:
+    head = f"{result.case:<36} {result.family:>9} n={result.size:<8}"
+    if result.status != "ok":
+        return f"{head} {result.status}: {result.reason}"
+
+    peak = f"{result.peak_bytes / 2**20:9.2f} MiB" if result.peak_bytes is not None else ""
+    return f"{head} median {result.median_s * 1000:10.3f} ms {peak}"
+
+
+def environment() -> Dict[str, Any]:
+    import numpy
+
+    return {
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "numpy": numpy.__version__,
+        "matplotlib": matplotlib.__version__,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def to_json_dict(results: List[BenchmarkResult], settings: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "environment": environment(),
+        "settings": settings,
+        "results": [asdict(result) for result in results],
+    }
+
+
+def compare(old: Dict[str, Any], new: Dict[str, Any]) -> List[str]:
+    '''Median ratios (new / old) for every case both runs completed'''
+    def key(r):
+        return (r["case"], r["family"], r["size"])
+
+    baseline = {key(r): r for r in old.get("results", []) if r["status"] == "ok"}
+    lines = []
+    for r in new.get("results", []):
+        before = baseline.get(key(r))
+        if r["status"] != "ok" or before is None or not before["median_s"]:
+            continue
+        ratio = r["median_s"] / before["median_s"]
+        lines.append(f"{r['case']:<36} {r['family']:>9} n={r['size']:<8} x{ratio:6.2f}")
+    return lines
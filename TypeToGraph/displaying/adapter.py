@@ -1,4 +1,6 @@
-from typing import Any, List, Dict, Optional, Protocol, runtime_checkable
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, List, Dict, Optional, Protocol, Tuple, runtime_checkable
 from models.display import DisplayNode
 from constants import *
 
@@ -25,13 +27,17 @@ class BinaryTreeAdapter:
     """Adapter for binary trees with improved parent tracking"""
     
     def to_display_nodes(self, tree) -> List[DisplayNode]:
-        nodes = []
-        
         try:
             levels = tree.get_display_values()
         except AttributeError:
             raise ValueError("Tree must implement get_display_values() method")
         
+        return self.levels_to_display_nodes(levels)
+    
+    def levels_to_display_nodes(self, levels: List[List[Any]]) -> List[DisplayNode]:
+        """get_display_values() output -> List[DisplayNode]"""
+        nodes = []
+        
         if not levels:
             return nodes
         
@@ -95,14 +101,18 @@ class DateBasedTreeAdapter:
         self.node_id_map = {}  # track node ids
     
     def to_display_nodes(self, tree) -> List[DisplayNode]:
-        nodes = []
-        self.node_id_map = {} # reset our nodes
-        
         try:
             levels = tree.get_display_values()
         except AttributeError:
             raise ValueError("Tree must implement get_display_values() method")
         
+        return self.levels_to_display_nodes(levels)
+    
+    def levels_to_display_nodes(self, levels: List[List[Any]]) -> List[DisplayNode]:
+        """get_display_values() output -> List[DisplayNode]"""
+        nodes = []
+        self.node_id_map = {} # reset our nodes
+        
         if not levels:
             return nodes
         
@@ -160,4 +170,184 @@ class DateBasedTreeAdapter:
     def _calculate_x_positions(self, num_nodes: int) -> List[float]:
         if num_nodes <= 0:
             return []
-        return [(i + 0.5) * (SCREEN_X / num_nodes) for i in range(num_nodes)]
\ No newline at end of file
+        return [(i + 0.5) * (SCREEN_X / num_nodes) for i in range(num_nodes)]
+
+class TypeGraphAdapter:
+    """Adapter for type reference graphs, each type hangs under the first type that references it"""
+    
+    def to_display_nodes(self, tree) -> List[DisplayNode]:
+        try:
+            levels = tree.get_display_values()
+        except AttributeError:
+            raise ValueError("Tree must implement get_display_values() method")
+        
+        return self.levels_to_display_nodes(levels)
+    
+    def levels_to_display_nodes(self, levels: List[List[Any]]) -> List[DisplayNode]:
+        """get_display_values() output -> List[DisplayNode]"""
+        nodes = []
+        
+        if not levels:
+            return nodes
+        
+        y_positions = self._calculate_y_positions(len(levels))
+        
+        for level_idx, level in enumerate(levels):
+            x_positions = self._calculate_x_positions(len(level))
+            
+            for i, type_node in enumerate(level):
+                # TypeNode.index is unique per tree, so ids never need a lookup table
+                parent = type_node.parent
+                nodes.append(DisplayNode(
+                    id=f"type_{type_node.index}",
+                    x=x_positions[i],
+                    y=y_positions[level_idx],
+                    label=str(type_node.value),
+                    data=type_node,
+                    parent_id=f"type_{parent.index}" if parent is not None else None
+                ))
+        
+        return nodes
+    
+    def _calculate_y_positions(self, num_levels: int) -> List[float]:
+        if num_levels <= 0:
+            return []
+        if num_levels == 1:
+            return [START_Y + AVAILABLE_SPACE / 2]
+        return [START_Y + (i / (num_levels - 1)) * AVAILABLE_SPACE for i in range(num_levels)]
+    
+    def _calculate_x_positions(self, num_nodes: int) -> List[float]:
+        if num_nodes <= 0:
+            return []
+        return [(i + 0.5) * (SCREEN_X / num_nodes) for i in range(num_nodes)]
+
+
+@dataclass
+class NoteHierarchy:
+    """
+    Flat, index based view of a note tree: entry i has label[i], data[i] and
+    parents[i] (index of its parent, -1 for years). Parents always come first.
+    """
+    labels: List[str] = field(default_factory=list)
+    data: List[Any] = field(default_factory=list)  # year/month key or Note
+    parents: List[int] = field(default_factory=list)
+    depths: List[int] = field(default_factory=list)
+    
+    def add(self, label: str, data: Any, parent: int, depth: int) -> int:
+        self.labels.append(label)
+        self.data.append(data)
+        self.parents.append(parent)
+        self.depths.append(depth)
+        return len(self.labels) - 1
+
+
+class NoteHierarchyAdapter:
+    """
+    Adapter for DateBasedNoteTree that also shows Note parent/child nesting:
+    Years -> Months -> top level notes -> child notes -> ...
+    
+    Built straight from tree.notes (the id index) in O(n), no get_display_values dicts.
+    Child notes are shown under their parent note instead of their own month.
+    """
+    
+    def to_display_nodes(self, tree) -> List[DisplayNode]:
+        return self.hierarchy_to_display_nodes(self.build_hierarchy(tree))
+    
+    def build_hierarchy(self, tree) -> NoteHierarchy:
+        try:
+            notes = tree.notes
+            date_hierarchy = tree.date_hierarchy
+        except AttributeError:
+            raise ValueError("Tree must have notes and date_hierarchy (see DateBasedNoteTree)")
+        
+        hierarchy = NoteHierarchy()
+        buckets: Dict[Tuple[str, str], int] = {}  # (year, month) -> month index
+        year_index: Dict[str, int] = {}
+        visited = set()
+        queue: deque = deque()  # (note, parent index, depth)
+        
+        def bucket(year: str, month: str) -> int:
+            if (year, month) not in buckets:
+                if year not in year_index:
+                    year_index[year] = hierarchy.add(year, year, -1, 0)
+                key = f"{year}-{month}"
+                buckets[(year, month)] = hierarchy.add(key, key, year_index[year], 1)
+            return buckets[(year, month)]
+        
+        def is_nested(note) -> bool:
+            return note.parent_id is not None and note.parent_id in notes
+        
+        def spread() -> None:
+            # breadth first, so parents get their index before their children
+            while queue:
+                note, parent, depth = queue.popleft()
+                index = hierarchy.add(note.title or note.content[:20], note, parent, depth)
+                for child_id in note.children_ids:
+                    child = notes.get(child_id)
+                    # children_ids and parent_id have to agree, and each note shows once
+                    if child is None or child.parent_id != note.id or child_id in visited:
+                        continue
+                    visited.add(child_id)
+                    queue.append((child, index, depth + 1))
+        
+        for year in sorted(date_hierarchy):
+            for month in sorted(date_hierarchy[year]):
+                # created on the first top level note, a month whose notes all sit under
+                # notes from other months would otherwise show up as an empty leaf
+                month_idx = None
+                for note_id in date_hierarchy[year][month]:
+                    note = notes.get(note_id)
+                    if note is None or note_id in visited or is_nested(note):
+                        continue
+                    if month_idx is None:
+                        month_idx = bucket(year, month)
+                    visited.add(note_id)
+                    queue.append((note, month_idx, 2))
+                spread()
+        
+        # notes the walk above could not reach (parent cycles, missing children_ids,
+        # not bucketed): show them at the top of their own month
+        for note_id, note in notes.items():
+            if note_id in visited:
+                continue
+            visited.add(note_id)
+            year = str(note.created_at.year)
+            queue.append((note, bucket(year, f"{note.created_at.month:02d}"), 2))
+            spread()
+        
+        return hierarchy
+    
+    def hierarchy_to_display_nodes(self, hierarchy: NoteHierarchy) -> List[DisplayNode]:
+        if not hierarchy.labels:
+            return []
+        
+        depths = hierarchy.depths
+        num_levels = max(depths) + 1
+        widths = [0] * num_levels
+        for depth in depths:
+            widths[depth] += 1
+        
+        y_positions = self._calculate_y_positions(num_levels)
+        slot = [0] * num_levels
+        nodes = []
+        
+        for i, (label, data, parent, depth) in enumerate(
+                zip(hierarchy.labels, hierarchy.data, hierarchy.parents, depths)):
+            nodes.append(DisplayNode(
+                id=str(i),
+                x=(slot[depth] + 0.5) * (SCREEN_X / widths[depth]),
+                y=y_positions[depth],
+                label=label,
+                data=data,
+                parent_id=str(parent) if parent >= 0 else None
+            ))
+            slot[depth] += 1
+        
+        return nodes
+    
+    def _calculate_y_positions(self, num_levels: int) -> List[float]:
+        if num_levels <= 0:
+            return []
+        if num_levels == 1:
+            return [START_Y + AVAILABLE_SPACE / 2]
+        return [START_Y + (i / (num_levels - 1)) * AVAILABLE_SPACE for i in range(num_levels)]
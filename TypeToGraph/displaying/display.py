@@ -3,12 +3,19 @@ import matplotlib.animation as animation
 from matplotlib.figure import Figure
 from matplotlib.axes import Axes
 import numpy as np
+from contextlib import nullcontext
 from typing import Optional, Dict
 
 from .layouts import LayoutEngine, SpringLayoutEngine
-from .adapter import BinaryTreeAdapter, DateBasedTreeAdapter, TreeAdapter
+from .adapter import (
+    BinaryTreeAdapter, DateBasedTreeAdapter, NoteHierarchyAdapter, TypeGraphAdapter, TreeAdapter
+)
+from .export import export_animation
+from .profiling import DisplayProfiler, DisplayStats
 from .widgets import NodeMovement
 
+_NO_STAGE = nullcontext()
+
 
 '''
 I was initally questioning if this needed to be a class but here is an analysis
@@ -20,6 +27,7 @@ States:
     ax
     _current_anim
     layout_engine (Dependency Injection) <- Biggest argument for a class
+    profiler (optional, see profiling.py)
     
 Encapsulates all of the logic with private methods
 
@@ -35,11 +43,16 @@ class GraphDisplayer:
     Default Engine: Spring Engine
     '''
 
-    def __init__(self, layout_engine: Optional[LayoutEngine] = None):
+    def __init__(self, layout_engine: Optional[LayoutEngine] = None,
+                profiler: Optional[DisplayProfiler] = None):
         self.layout_engine = layout_engine or SpringLayoutEngine()
+        self.profiler = profiler
+        self.last_stats: Optional[DisplayStats] = None
         self.adapters: Dict[str, TreeAdapter] = {
             'BinaryTree': BinaryTreeAdapter(),
             'DateBasedNodeTree': DateBasedTreeAdapter(), 
+            'DateBasedNoteTree': NoteHierarchyAdapter(),
+            'TypeGraphTree': TypeGraphAdapter(),
         }
 
         self.current_nodes = []
@@ -59,23 +72,77 @@ class GraphDisplayer:
             raise ValueError(f"No adapter available for {tree_type}. Available: {list(self.adapters.keys())}")
 
         adapter = self.adapters[tree_type]
-        self.current_nodes = adapter.to_display_nodes(tree)
-        
-        if not self.current_nodes:
-            raise ValueError("No Nodes to display")
-
-        final_positions = self.layout_engine.calculate_positions(self.current_nodes)
-        self.current_positions = final_positions
+        if self.profiler is not None:
+            self.last_stats = self.profiler.begin(tree_type, self.layout_engine)
+
+        try:
+            self.current_nodes = self._to_display_nodes(adapter, tree)
+            
+            if not self.current_nodes:
+                raise ValueError("No Nodes to display")
+
+            final_positions = self._calculate_positions()
+            self.current_positions = final_positions
+
+            
+            if animate:
+                self._animate_to_layout()
+            else:
+                self._static_display()
+        finally:
+            # before plt.show(), which blocks until the window is closed on GUI backends
+            if self.profiler is not None:
+                self.profiler.finish()
 
-        
-        if animate:
-            self._animate_to_layout()
-        else:
-            self._static_display()
-        
+        plt.show()
         self.start_node_movement()
         
 
+    def _stage(self, name: str):
+        """Profiler stage, or a shared no-op context when profiling is off"""
+        if self.profiler is None:
+            return _NO_STAGE
+        return self.profiler.stage(name)
+
+    def _to_display_nodes(self, adapter: TreeAdapter, tree):
+        if self.profiler is None or not hasattr(adapter, 'levels_to_display_nodes'):
+            with self._stage('to_display_nodes'):
+                return adapter.to_display_nodes(tree)
+
+        # split so the tree traversal and the conversion are timed separately
+        with self.profiler.stage('get_display_values'):
+            levels = tree.get_display_values()
+        with self.profiler.stage('to_display_nodes'):
+            return adapter.levels_to_display_nodes(levels)
+
+    def _calculate_positions(self):
+        if self.profiler is None:
+            return self.layout_engine.calculate_positions(self.current_nodes)
+
+        profiler = self.profiler
+        profiler.stats.node_count = len(self.current_nodes)
+        profiler.stats.edge_count = sum(1 for node in self.current_nodes if node.parent_id)
+
+        # route per-iteration reports to the profiler without dropping a user callback
+        engine = self.layout_engine
+        previous = getattr(engine, 'iteration_callback', None)
+
+        def on_iteration(iteration: int, energy: float, max_displacement: float) -> None:
+            profiler.record_iteration(iteration, energy, max_displacement)
+            if previous is not None:
+                previous(iteration, energy, max_displacement)
+
+        engine.iteration_callback = on_iteration
+        try:
+            with profiler.stage('calculate_positions'):
+                positions = engine.calculate_positions(self.current_nodes)
+        finally:
+            engine.iteration_callback = previous
+
+        profiler.stats.iterations_used = getattr(engine, 'iterations_used', None)
+        profiler.stats.converged = getattr(engine, 'converged', None)
+        return positions
+
     def start_node_movement(self) -> None:
         '''Start the node movement widget for interactive node manipulation'''
         if not self.fig or not self.current_positions:
@@ -87,37 +154,48 @@ class GraphDisplayer:
 
     def _static_display(self):
         """Display without animation"""
-        self.fig, self.ax = plt.subplots(figsize=(12, 8))
-        
-        # draw nodes
-        x_coords = [self.current_positions[node.id][0] for node in self.current_nodes]
-        y_coords = [self.current_positions[node.id][1] for node in self.current_nodes]
-        
-        self.ax.scatter(x_coords, y_coords, s=300, c='lightblue',
-                    edgecolors='black', zorder=3)
-
-        # draw edges
-        for node in self.current_nodes:
-            if node.parent_id and node.parent_id in self.current_positions:
-                x1, y1 = self.current_positions[node.parent_id]
-                x2, y2 = self.current_positions[node.id]
-                self.ax.plot([x1, x2], [y1, y2], 'k-', alpha=0.6, zorder=1)
-
-        # draw labels
-        for node in self.current_nodes:
-            x, y = self.current_positions[node.id]
-            self.ax.text(x, y, node.label, ha='center', va='center', fontsize=10, zorder=4)
-
-        self._setup_axes()
-        plt.show()
+        with self._stage('draw'):
+            self.fig, self.ax = plt.subplots(figsize=(12, 8))
+            
+            # draw nodes
+            x_coords = [self.current_positions[node.id][0] for node in self.current_nodes]
+            y_coords = [self.current_positions[node.id][1] for node in self.current_nodes]
+            
+            self.ax.scatter(x_coords, y_coords, s=300, c='lightblue',
+                        edgecolors='black', zorder=3)
+
+            # draw edges
+            for node in self.current_nodes:
+                if node.parent_id and node.parent_id in self.current_positions:
+                    x1, y1 = self.current_positions[node.parent_id]
+                    x2, y2 = self.current_positions[node.id]
+                    self.ax.plot([x1, x2], [y1, y2], 'k-', alpha=0.6, zorder=1)
+
+            # draw labels
+            for node in self.current_nodes:
+                x, y = self.current_positions[node.id]
+                self.ax.text(x, y, node.label, ha='center', va='center', fontsize=10, zorder=4)
+
+            self._setup_axes()
 
     def _animate_to_layout(self):
         '''Animate nodes to final positions'''
-        self.fig, self.ax = plt.subplots(figsize=(12, 8))
+        with self._stage('draw'):
+            self.fig, self.ax = plt.subplots(figsize=(12, 8))
         initial_pos = {node.id: (node.x, node.y) for node in self.current_nodes}
         total_frames = 50
 
+        # frames are drawn after display() returned, keep them in this display's stats
+        # even if the displayer has moved on to another tree by then
+        profiler, stats = self.profiler, self.last_stats
+
         def animate(frame):
+            if profiler is None:
+                return draw_frame(frame)
+            with profiler.stage('animate_frame', stats):
+                return draw_frame(frame)
+
+        def draw_frame(frame):
             if self.ax is None:
                 raise RuntimeError("Axes object is None during animation")
 
@@ -163,8 +241,6 @@ class GraphDisplayer:
             self.fig, animate, frames=total_frames, interval=100, repeat=False, blit=False
         )
 
-        plt.show()
-
     def _setup_axes(self):
         """Configure axes settings"""
         if isinstance(self.ax, Axes):
@@ -173,8 +249,26 @@ class GraphDisplayer:
             self.ax.set_aspect('equal')
             self.ax.axis('off')
 
+    def export_animation(self, filename: str, frames: int = 50, fps: int = 10,
+                        workers: Optional[int] = None, buffer_size: Optional[int] = None,
+                        writer: Optional[str] = None) -> int:
+        """
+        Render the layout animation in worker processes and stream it to file (see export.py).
+        workers=0 renders in this process, buffer_size bounds the frames held in memory.
+        Worker processes re-import __main__, so scripts need an `if __name__ == '__main__':` guard.
+        """
+        if not self.current_nodes or not self.current_positions:
+            raise RuntimeError("Display must be called before exporting an animation")
+
+        with self._stage('export'):
+            return export_animation(
+                self.current_nodes, self.current_positions, filename,
+                total_frames=frames, fps=fps, workers=workers,
+                buffer_size=buffer_size, writer=writer,
+            )
+
     def save_animation(self, filename: str, writer: str = 'pillow'):
-        """Save the current animation to file"""
+        """Save the current animation to file (serial replay, export_animation is faster)"""
         if self._current_animation:
             self._current_animation.save(filename, writer=writer)
         else:
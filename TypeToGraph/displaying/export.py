@@ -0,0 +1,286 @@
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor
+from typing import Deque, Dict, List, Optional, Tuple
+import multiprocessing
+import os
+import subprocess
+import warnings
+
+import numpy as np
+from matplotlib import animation
+from matplotlib import rcParams
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.collections import LineCollection
+from matplotlib.figure import Figure
+
+from models.display import DisplayNode
+from constants import *
+
+
+'''
+    Animation export
+
+    FuncAnimation.save redraws every frame serially and the pillow writer keeps every
+    RGBA frame until the end. Here:
+        1. all interpolated positions are computed up front as one (frames, nodes, 2) array
+        2. frames are rasterized with Agg in worker processes (plain Figure, no pyplot)
+        3. at most `buffer_size` frames are in flight, results are written in frame order
+
+    ffmpeg gets the frames on stdin so nothing is kept around. Without ffmpeg the pillow
+    fallback still has to hold the whole GIF (buffer_size does not help there), but frames
+    are palette-quantized as they arrive (1 byte per pixel instead of 4).
+'''
+
+Frame = Tuple[int, int, bytes]  # width, height, RGBA bytes
+
+# rough costs measured with Agg: a frame is ~0.15s plus ~1.3ms per node, starting a
+# spawned worker (fresh interpreter + matplotlib import) is ~1.5s
+_FRAME_COST_S = 0.15
+_NODE_COST_S = 0.0013
+_WORKER_STARTUP_S = 1.5
+
+# pillow keeps every frame until the end, warn before that gets big
+PILLOW_FRAME_WARNING = 300
+
+# per-process drawing state, set once by _init_worker so tasks only carry positions
+_worker_state: Dict[str, object] = {}
+
+
+def interpolate_frames(start: np.ndarray, end: np.ndarray, total_frames: int) -> np.ndarray:
+    '''(nodes, 2) start/end -> (frames, nodes, 2) using the same smooth step as the live animation'''
+    if total_frames <= 1:
+        return end[np.newaxis].copy()
+
+    t = np.linspace(0.0, 1.0, total_frames)
+    t_smooth = 3 * t**2 - 2 * t**3
+    return start[np.newaxis] + t_smooth[:, np.newaxis, np.newaxis] * (end - start)[np.newaxis]
+
+
+def frame_arrays(nodes: List[DisplayNode], positions: Dict[str, Tuple[float, float]],
+                total_frames: int) -> Tuple[np.ndarray, np.ndarray, List[str]]:
+    '''Returns (frames, edges, labels); edges are (parent index, child index) rows'''
+    index = {node.id: i for i, node in enumerate(nodes)}
+    start = np.array([(node.x, node.y) for node in nodes], dtype=float)
+    end = np.array([positions[node.id] for node in nodes], dtype=float)
+
+    edges = np.array([(index[node.parent_id], i) for i, node in enumerate(nodes)
+                    if node.parent_id and node.parent_id in index], dtype=np.intp).reshape(-1, 2)
+    labels = [node.label for node in nodes]
+
+    return interpolate_frames(start, end, total_frames), edges, labels
+
+
+def _init_worker(edges: np.ndarray, labels: List[str], total_frames: int,
+                figsize: Tuple[float, float], dpi: int) -> None:
+    _worker_state.update(edges=edges, labels=labels, total_frames=total_frames,
+                        figsize=figsize, dpi=dpi)
+
+
+def _render_frame(frame: int, pos: np.ndarray) -> Frame:
+    state = _worker_state
+    fig = Figure(figsize=state['figsize'], dpi=state['dpi'])
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    # one collection for all edges instead of a Line2D per edge
+    edges = state['edges']
+    if len(edges):
+        segments = np.stack([pos[edges[:, 0]], pos[edges[:, 1]]], axis=1)
+        ax.add_collection(LineCollection(segments, colors='k', alpha=0.6, zorder=1))
+
+    ax.scatter(pos[:, 0], pos[:, 1], s=300, c='lightblue', edgecolors='black', zorder=3)
+
+    for (x, y), label in zip(pos, state['labels']):
+        ax.text(x, y, label, ha='center', va='center', fontsize=10, zorder=4)
+
+    ax.set_xlim(0, SCREEN_X)
+    ax.set_ylim(SCREEN_Y, 0)
+    ax.set_aspect('equal')
+    ax.axis('off')
+    ax.set_title(f'Animation Frame {frame+1}/{state["total_frames"]}')
+
+    canvas.draw()
+    width, height = canvas.get_width_height()
+    return width, height, bytes(canvas.buffer_rgba())
+
+
+class _SerialExecutor(Executor):
+    '''workers=0: same pipeline, rendered in this process'''
+
+    def submit(self, fn, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            future.set_exception(e)
+        return future
+
+
+class _FFMpegSink:
+    '''Streams raw RGBA frames into ffmpeg's stdin'''
+
+    def __init__(self, filename: str, width: int, height: int, fps: int):
+        cmd = [
+            rcParams['animation.ffmpeg_path'], '-y', '-loglevel', 'error',
+            '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps),
+            '-i', '-',
+        ]
+        if not filename.lower().endswith('.gif'):
+            # most video codecs need even dimensions and yuv420p to play everywhere
+            cmd += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p']
+        cmd.append(filename)
+        self._proc = subprocess.Popen(cmd, stdin=subprocess.PIPE)
+
+    def write(self, frame: Frame) -> None:
+        assert self._proc.stdin is not None
+        self._proc.stdin.write(frame[2])
+
+    def close(self) -> None:
+        assert self._proc.stdin is not None
+        self._proc.stdin.close()
+        if self._proc.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with code {self._proc.returncode}")
+
+    def abort(self) -> None:
+        self._proc.kill()
+        self._proc.wait()
+
+
+class _PillowSink:
+    '''Pillow writes a GIF in one go, so keep palette frames (1 byte per pixel) until close'''
+
+    def __init__(self, filename: str, fps: int):
+        self.filename = filename
+        self.fps = fps
+        self._frames = []
+
+    def write(self, frame: Frame) -> None:
+        from PIL import Image
+
+        width, height, data = frame
+        image = Image.frombuffer('RGBA', (width, height), data, 'raw', 'RGBA', 0, 1)
+        self._frames.append(image.convert('RGB').quantize(colors=256))
+
+    def close(self) -> None:
+        if not self._frames:
+            return
+        first, *rest = self._frames
+        first.save(self.filename, save_all=True, append_images=rest,
+                duration=int(1000 / self.fps), loop=0)
+        self._frames = []
+
+    def abort(self) -> None:
+        self._frames = []
+
+
+WRITERS = ['ffmpeg', 'pillow']
+PILLOW_EXTENSIONS = ['.gif', '.png', '.webp']
+
+
+def _resolve_writer(writer: Optional[str], filename: str) -> str:
+    '''Picks the writer and checks it can produce `filename` before anything is rendered'''
+    has_ffmpeg = animation.writers.is_available('ffmpeg')
+    if writer is None:
+        writer = 'ffmpeg' if has_ffmpeg else 'pillow'
+    elif writer not in WRITERS:
+        raise ValueError(f"Unknown writer {writer}. Available: {WRITERS}")
+
+    if writer == 'ffmpeg' and not has_ffmpeg:
+        raise RuntimeError("ffmpeg writer requested but ffmpeg was not found")
+
+    extension = os.path.splitext(filename)[1].lower()
+    if writer == 'pillow' and extension not in PILLOW_EXTENSIONS:
+        reason = "" if has_ffmpeg else " (ffmpeg was not found)"
+        raise ValueError(f"Pillow can only write {PILLOW_EXTENSIONS}, not '{extension}'{reason}. "
+                        f"Install ffmpeg or export to a .gif instead")
+    return writer
+
+
+def _default_workers(frame_count: int, node_count: int) -> int:
+    '''Only use processes when every worker gets more work than it costs to start'''
+    estimate = frame_count * (_FRAME_COST_S + node_count * _NODE_COST_S)
+    workers = min(os.cpu_count() or 1, frame_count, int(estimate / _WORKER_STARTUP_S))
+    # a single worker process is just a slower serial export
+    return workers if workers > 1 else 0
+
+
+def _open_sink(filename: str, writer: str, frame: Frame, fps: int):
+    if writer == 'ffmpeg':
+        return _FFMpegSink(filename, frame[0], frame[1], fps)
+    return _PillowSink(filename, fps)
+
+
+def export_animation(nodes: List[DisplayNode], positions: Dict[str, Tuple[float, float]],
+                    filename: str, total_frames: int = 50, fps: int = 10,
+                    workers: Optional[int] = None, buffer_size: Optional[int] = None,
+                    writer: Optional[str] = None, figsize: Tuple[float, float] = (12, 8),
+                    dpi: int = 100) -> int:
+    '''
+    Render the start -> final layout animation to `filename`. Returns frames written.
+
+    workers=None picks a count from the amount of work (small exports render in this
+    process), workers=0 forces serial rendering. Workers are started with `spawn`, which
+    re-imports the caller's __main__ module, so scripts calling this with workers need an
+    `if __name__ == '__main__':` guard.
+
+    buffer_size bounds the frames in flight; with the pillow writer the finished file is
+    still held in memory (see PILLOW_FRAME_WARNING).
+    '''
+    if not nodes:
+        raise ValueError("No Nodes to export")
+    writer = _resolve_writer(writer, filename)
+
+    frames, edges, labels = frame_arrays(nodes, positions, total_frames)
+    init_args = (edges, labels, len(frames), figsize, dpi)
+
+    if writer == 'pillow' and len(frames) > PILLOW_FRAME_WARNING:
+        frame_bytes = figsize[0] * figsize[1] * dpi * dpi
+        warnings.warn(f"Pillow keeps all {len(frames)} frames in memory "
+                    f"(~{len(frames) * frame_bytes / 2**20:.0f} MiB), install ffmpeg to stream them")
+
+    if workers is None:
+        workers = _default_workers(len(frames), len(nodes))
+    buffer_size = max(1, buffer_size or 2 * max(1, workers))
+
+    if workers <= 0:
+        _init_worker(*init_args)
+        executor: Executor = _SerialExecutor()
+    else:
+        # spawn: forking a process that may already run a GUI backend is not safe
+        executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker, initargs=init_args,
+        )
+
+    sink = None
+    written = 0
+    pending: Deque = deque()
+    next_frame = 0
+
+    try:
+        with executor:
+            try:
+                while written < len(frames):
+                    # keep the window full, never more than buffer_size frames in memory
+                    while next_frame < len(frames) and len(pending) < buffer_size:
+                        pending.append(executor.submit(_render_frame, next_frame, frames[next_frame]))
+                        next_frame += 1
+
+                    frame = pending.popleft().result()
+                    if sink is None:
+                        sink = _open_sink(filename, writer, frame, fps)
+                    sink.write(frame)
+                    written += 1
+            except BaseException:
+                # before leaving the with block: its shutdown waits for every queued frame
+                for future in pending:
+                    future.cancel()
+                raise
+    except BaseException:
+        if sink is not None:
+            sink.abort()
+        raise
+
+    if sink is not None:
+        sink.close()
+    return written
@@ -1,75 +1,261 @@
-import networkx as nx
-from typing import List, Dict, Tuple, Optional
+from collections import deque
+from typing import Callable, Deque, List, Dict, Tuple, Optional
 from abc import abstractmethod, ABC
 import math
 
+import numpy as np
+
 from models.display import DisplayNode
 from constants import *
 
 
+# (iteration, energy, max displacement)
+IterationCallback = Callable[[int, float, float], None]
+
+# pair distances computed per block in the spring repulsion step
+_REPULSION_BLOCK = 1_000_000
+
+# fraction of the net force a node follows per step once below the temperature. The
+# Fruchterman-Reingold force has slope -3 around an edge's rest length, so following it
+# fully overshoots and oscillates instead of settling.
+_FR_GAIN = 0.33
+
+# FIRE settings of ForceDirectedLayoutEngine: first time step, how far it can grow and by
+# how much, after how many downhill steps, and how strongly the velocity is steered
+_FIRE_DT = 2.0
+_FIRE_MAX_DT = 8.0
+_FIRE_GROWTH = 1.1
+_FIRE_PATIENCE = 5
+_FIRE_ALPHA = 0.25
+_FIRE_ALPHA_DECAY = 0.99
+
+
 class LayoutEngine(ABC):
     """Abstract base for layout algorithms"""
     
+    # iterative engines call this once per step, see displaying.profiling
+    iteration_callback: Optional[IterationCallback] = None
+    
+    # set by iterative engines after each calculate_positions call
+    iterations_used: Optional[int] = None
+    converged: Optional[bool] = None
+    
     @abstractmethod
     def calculate_positions(self, nodes: List[DisplayNode]) -> Dict[str, Tuple[float, float]]:
         """Calculate final positions for nodes"""
         pass
 
 
+class AdaptiveCooling:
+    """
+    Adaptive step length (Yifan Hu, "Efficient and high quality force-directed graph drawing").
+    The step grows after `patience` iterations in a row that lowered the energy
+    and shrinks by `cooling` whenever the energy goes up.
+    """
+    
+    def __init__(self, step: float, cooling: float = 0.9, patience: int = 5,
+                max_step: Optional[float] = None):
+        self.step = step
+        self.cooling = cooling
+        self.patience = patience
+        self.max_step = max_step if max_step is not None else step
+        self._energy = math.inf
+        self._progress = 0
+    
+    def update(self, energy: float) -> float:
+        if energy < self._energy:
+            self._progress += 1
+            if self._progress >= self.patience:
+                self._progress = 0
+                self.step = min(self.max_step, self.step / self.cooling)
+        else:
+            self._progress = 0
+            self.step *= self.cooling
+        
+        self._energy = energy
+        return self.step
+
+
+class Convergence:
+    """
+    Stopping test for iterative engines. Converged once, for `window` iterations in a
+    row, the largest move stayed below `tolerance * scale` (scale = current size of the
+    layout) or the energy stayed within `rtol` (relative) of where the window started.
+    A single slow iteration (e.g. a node turning around) is not enough.
+    """
+    
+    def __init__(self, tolerance: float, rtol: float, window: int = 5):
+        self.tolerance = tolerance
+        self.rtol = rtol
+        self.window = window
+        self._still = 0
+        self._energies: Deque[float] = deque(maxlen=window + 1)
+    
+    def update(self, energy: float, max_displacement: float, scale: float) -> bool:
+        self._still = self._still + 1 if max_displacement < self.tolerance * scale else 0
+        if self._still >= self.window:
+            return True
+        
+        self._energies.append(energy)
+        if len(self._energies) < self._energies.maxlen:
+            return False
+        
+        before = self._energies[0]
+        return max(abs(e - before) for e in self._energies) <= self.rtol * abs(before)
+
+
 class SpringLayoutEngine(LayoutEngine):
-    """NetworkX spring layout implementation with bounds checking"""
+    """
+    Fruchterman-Reingold spring layout with bounds checking. A port of networkx.spring_layout's
+    force method so every iteration can be reported; with adaptive=False it gives the same
+    positions as networkx (>= 3.5, see tests/test_layouts.py). networkx switches to a scipy
+    based method from 500 nodes on, this engine always uses the force method.
+    """
     
-    def __init__(self, k: float = 1, iterations: int = 50, seed: Optional[int] = None):
+    def __init__(self, k: float = 1, iterations: int = 50, seed: Optional[int] = None,
+                threshold: float = 1e-4, adaptive: bool = True, tolerance: float = 5e-3,
+                rtol: float = 1e-2, cooling: float = 0.9):
         self.k = k
-        self.iterations = iterations
+        self.iterations = iterations  # upper bound, converged layouts stop earlier
+        # kept for compatibility: networkx only used it for nodes without a start position,
+        # and the adapter gives every node one
         self.seed = seed
+        self.threshold = threshold  # mean displacement per node (networkx's stopping rule)
+        # False: networkx's linear cooling and stopping rule, exactly as before
+        self.adaptive = adaptive
+        self.tolerance = tolerance  # largest move, relative to the layout size
+        self.rtol = rtol  # relative energy change that counts as a plateau
+        self.cooling = cooling
     
     def calculate_positions(self, nodes: List[DisplayNode]) -> Dict[str, Tuple[float, float]]:
+        self.iterations_used = 0
+        self.converged = True
+        
         if not nodes:
             return {}
-            
-        # Create NetworkX graph
-        G = nx.Graph()
-        initial_pos = {}
-        
-        for node in nodes:
-            G.add_node(node.id)
-            
-            # Normalize initial positions to [-1, 1] range for spring layout
-            initial_pos[node.id] = (
-                (node.x / SCREEN_X) * 2 - 1,
-                (node.y / SCREEN_Y) * 2 - 1
-            )
-            
-            # ^ initially tried [0, SCREEN_X] but it proved to be a little off
-            
-            # did some more research: the algorithm uses a default scale of 1 (0,0 being the middle so it's -1, 1)
-            
-            if node.parent_id:
-                G.add_edge(node.parent_id, node.id)
         
         # Handle single node case
         if len(nodes) == 1:
             return {nodes[0].id: (SCREEN_X / 2, SCREEN_Y / 2)}
         
+        index = {node.id: i for i, node in enumerate(nodes)}
+        
+        # Normalize initial positions to [-1, 1] range for spring layout
+        # ^ initially tried [0, SCREEN_X] but it proved to be a little off
+        pos = np.array([
+            ((node.x / SCREEN_X) * 2 - 1, (node.y / SCREEN_Y) * 2 - 1)
+            for node in nodes
+        ], dtype=float)
+        
+        # edges as index arrays instead of a dense adjacency matrix
+        edges = [(index[node.parent_id], i) for i, node in enumerate(nodes)
+                if node.parent_id and node.parent_id in index]
+        src = np.array([e[0] for e in edges], dtype=np.intp)
+        dst = np.array([e[1] for e in edges], dtype=np.intp)
+        
         # apply spring layout
         try:
-            spring_pos = nx.spring_layout(
-                G, pos=initial_pos, k=self.k, 
-                iterations=self.iterations, seed=self.seed
-            )
+            pos = self._fruchterman_reingold(pos, src, dst)
         except Exception as e:
             print(f"Spring layout failed: {e}. Using hierarchical fallback.")
             return HierarchicalLayoutEngine().calculate_positions(nodes)
         
+        # center and rescale to [-1, 1] (what networkx's rescale_layout does)
+        pos -= pos.mean(axis=0)
+        lim = np.abs(pos).max()
+        if lim > 0:
+            pos /= lim
+        
         # Scale to screen coordinates with bounds checking
         final_pos = {}
-        for node_id, (x, y) in spring_pos.items():
+        for node, (x, y) in zip(nodes, pos):
             scaled_x = max(50, min(SCREEN_X - 50, (x + 1) * SCREEN_X / 2))
             scaled_y = max(50, min(SCREEN_Y - 50, (y + 1) * SCREEN_Y / 2))
-            final_pos[node_id] = (scaled_x, scaled_y)
+            final_pos[node.id] = (float(scaled_x), float(scaled_y))
         
         return final_pos
+    
+    def _fruchterman_reingold(self, pos: np.ndarray, src: np.ndarray, dst: np.ndarray) -> np.ndarray:
+        n = len(pos)
+        k = self.k
+        
+        if self.adaptive and len(src):
+            # the result is rescaled afterwards, so start at the natural edge length k
+            # instead of spending iterations growing out of [-1, 1]
+            mean_edge = np.linalg.norm(pos[src] - pos[dst], axis=-1).mean()
+            if mean_edge > 0:
+                pos = pos * (k / mean_edge)
+        
+        # start at 10% of the domain size
+        t = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1])) * 0.1
+        dt = t / (self.iterations + 1)
+        # the layout is free to grow, so the step may too
+        schedule = AdaptiveCooling(t, self.cooling, max_step=math.inf) if self.adaptive else None
+        convergence = Convergence(self.tolerance, self.rtol) if self.adaptive else None
+        self.converged = False
+        
+        for iteration in range(self.iterations):
+            displacement = self._repulsion(pos, k)
+            
+            # attraction only along edges
+            delta = pos[src] - pos[dst]
+            distance = np.clip(np.linalg.norm(delta, axis=-1), 0.01, None)
+            pull = delta * (distance / k)[:, np.newaxis]
+            np.add.at(displacement, src, -pull)
+            np.add.at(displacement, dst, pull)
+            
+            length = np.linalg.norm(displacement, axis=-1)
+            # networkx >= 3.5 clips tiny forces (gh-8113), earlier versions replaced them with 0.1
+            length = np.clip(length, 0.01, None)
+            if schedule is None:
+                # networkx: every node moves by exactly the temperature
+                delta_pos = displacement * (t / length)[:, np.newaxis]
+            else:
+                # original Fruchterman-Reingold: the temperature only caps the move,
+                # so moves shrink with the forces as the layout settles
+                delta_pos = displacement * (np.minimum(length * _FR_GAIN, t) / length)[:, np.newaxis]
+            pos += delta_pos
+            
+            step = np.linalg.norm(delta_pos, axis=-1)
+            energy = float(0.5 * np.dot(step, step))
+            max_step = float(step.max())
+            self.iterations_used = iteration + 1
+            
+            if self.iteration_callback is not None:
+                self.iteration_callback(iteration, energy, max_step)
+            
+            if np.linalg.norm(delta_pos) / n < self.threshold:
+                self.converged = True
+                break
+            
+            if schedule is None or convergence is None:
+                t -= dt
+                continue
+            
+            # the schedule and the plateau test follow the force energy
+            force_energy = float(np.einsum('ij,ij->', displacement, displacement))
+            extent = max(np.ptp(pos[:, 0]), np.ptp(pos[:, 1]))
+            if convergence.update(force_energy, max_step, extent):
+                self.converged = True
+                break
+            t = schedule.update(force_energy)
+        
+        return pos
+    
+    @staticmethod
+    def _repulsion(pos: np.ndarray, k: float) -> np.ndarray:
+        """k^2 / d repulsion between all pairs, in row blocks so memory stays O(n)"""
+        n = len(pos)
+        displacement = np.empty_like(pos)
+        step = max(1, _REPULSION_BLOCK // n)
+        
+        for start in range(0, n, step):
+            delta = pos[start:start + step, np.newaxis, :] - pos[np.newaxis, :, :]
+            distance = np.linalg.norm(delta, axis=-1)
+            np.clip(distance, 0.01, None, out=distance)
+            displacement[start:start + step] = np.einsum('ijk,ij->ik', delta, k * k / distance**2)
+        
+        return displacement
 
 
 class HierarchicalLayoutEngine(LayoutEngine):
@@ -105,16 +291,48 @@ class CircularLayoutEngine(LayoutEngine):
 
 
 class ForceDirectedLayoutEngine(LayoutEngine):
-    """Custom force-directed layout with configurable parameters"""
+    """
+    Custom force-directed layout with configurable parameters.
+    
+    The adaptive mode integrates with FIRE (Bitzek et al., "Structural relaxation made simple"):
+    the velocity is steered towards the net force, the time step grows while the layout
+    keeps going downhill and everything stops and shrinks by `cooling` as soon as it
+    overshoots. Plain momentum settles the slow, floppy parts of a tree (a subtree
+    swinging around its parent) very slowly, FIRE does not. The start positions are
+    scaled first so that edges have about their rest length.
+    """
     
     def __init__(self, attraction: float = 0.01, repulsion: float = 1000, 
-                damping: float = 0.9, iterations: int = 100):
+                damping: float = 0.9, iterations: int = 100, adaptive: bool = True,
+                tolerance: float = 1e-3, rtol: float = 0.0, max_step: Optional[float] = None,
+                cooling: float = 0.5, iterations_per_node: int = 5):
         self.attraction = attraction
         self.repulsion = repulsion
         self.damping = damping
+        # upper bound, converged layouts stop earlier. The adaptive mode allows
+        # iterations_per_node * len(nodes) when that is more: big trees need longer to settle
         self.iterations = iterations
+        self.iterations_per_node = iterations_per_node
+        # False: uncapped moves and always `iterations` steps, exactly as before
+        self.adaptive = adaptive
+        self.tolerance = tolerance  # largest move (or what the force would move), relative to the screen
+        # relative force energy change that counts as a plateau, off by default: the
+        # energy also stays flat while FIRE recovers from an overshoot with a tiny step
+        self.rtol = rtol
+        # longest move per step, half an edge by default: with longer steps two nodes
+        # can land almost on top of each other and the repulsion throws them apart
+        self.max_step = max_step if max_step is not None else self.rest_length / 2
+        self.cooling = cooling
+    
+    @property
+    def rest_length(self) -> float:
+        '''Edge length at which a parent and its only child stop pulling/pushing each other'''
+        return (self.repulsion / self.attraction) ** (1 / 3)
     
     def calculate_positions(self, nodes: List[DisplayNode]) -> Dict[str, Tuple[float, float]]:
+        self.iterations_used = 0
+        self.converged = True
+        
         if not nodes:
             return {}
         
@@ -131,46 +349,147 @@ class ForceDirectedLayoutEngine(LayoutEngine):
             if node.parent_id:
                 edges.append((node.parent_id, node.id))
         
-        for _ in range(self.iterations):
-            forces = {node.id: [0.0, 0.0] for node in nodes}
-            
-            # Repulsive forces between all nodes
-            for i, node1 in enumerate(nodes):
-                for node2 in nodes[i+1:]:
-                    dx = positions[node2.id][0] - positions[node1.id][0]
-                    dy = positions[node2.id][1] - positions[node1.id][1]
-                    distance = math.sqrt(dx*dx + dy*dy) + 0.1  # Avoid division by zero
-                    
-                    force = self.repulsion / (distance * distance)
-                    fx = force * dx / distance
-                    fy = force * dy / distance
-                    
-                    forces[node1.id][0] -= fx
-                    forces[node1.id][1] -= fy
-                    forces[node2.id][0] += fx
-                    forces[node2.id][1] += fy
+        iterations = self.iterations
+        convergence = None
+        if self.adaptive:
+            iterations = max(iterations, self.iterations_per_node * len(nodes))
+            convergence = Convergence(self.tolerance, self.rtol)
+            self._scale_to_rest_length(positions, edges)
+            dt, alpha, downhill = _FIRE_DT, _FIRE_ALPHA, 0
+        self.converged = False
+        
+        for iteration in range(iterations):
+            forces = self._forces(nodes, positions, edges)
             
-            # Attractive forces along edges
-            for parent_id, child_id in edges:
-                if parent_id in positions and child_id in positions:
-                    dx = positions[child_id][0] - positions[parent_id][0]
-                    dy = positions[child_id][1] - positions[parent_id][1]
-                    
-                    forces[parent_id][0] += self.attraction * dx
-                    forces[parent_id][1] += self.attraction * dy
-                    forces[child_id][0] -= self.attraction * dx
-                    forces[child_id][1] -= self.attraction * dy
+            if convergence is not None:
+                # a node pushed into a wall does not move, so that part of the force
+                # must neither steer the others nor keep the layout from converging
+                for node_id, (x, y) in positions.items():
+                    force = forces[node_id]
+                    if (x <= 50 and force[0] < 0) or (x >= SCREEN_X - 50 and force[0] > 0):
+                        force[0] = 0.0
+                    if (y <= 50 and force[1] < 0) or (y >= SCREEN_Y - 50 and force[1] > 0):
+                        force[1] = 0.0
+                
+                power = sum(velocities[node_id][0] * fx + velocities[node_id][1] * fy
+                            for node_id, (fx, fy) in forces.items())
+                if power > 0:
+                    # going downhill: turn the velocity towards the force, speed up after a while
+                    speed = math.sqrt(sum(vx * vx + vy * vy for vx, vy in velocities.values()))
+                    force_norm = math.sqrt(sum(fx * fx + fy * fy for fx, fy in forces.values()))
+                    turn = alpha * speed / max(force_norm, 1e-12)
+                    for node_id, velocity in velocities.items():
+                        velocity[0] = (1 - alpha) * velocity[0] + turn * forces[node_id][0]
+                        velocity[1] = (1 - alpha) * velocity[1] + turn * forces[node_id][1]
+                    downhill += 1
+                    if downhill > _FIRE_PATIENCE:
+                        dt = min(dt * _FIRE_GROWTH, _FIRE_MAX_DT)
+                        alpha *= _FIRE_ALPHA_DECAY
+                elif iteration > 0:
+                    # overshot: stop everything and take smaller steps
+                    for velocity in velocities.values():
+                        velocity[0] = velocity[1] = 0.0
+                    dt = max(dt * self.cooling, _FIRE_DT / 50)
+                    alpha, downhill = _FIRE_ALPHA, 0
+                step = dt
+            else:
+                step = 1.0
             
             # Update positions
+            energy = 0.0
+            max_displacement = 0.0
+            max_force = 0.0
             for node in nodes:
-                velocities[node.id][0] = self.damping * velocities[node.id][0] + forces[node.id][0]
-                velocities[node.id][1] = self.damping * velocities[node.id][1] + forces[node.id][1]
+                velocity = velocities[node.id]
+                velocity[0] = self.damping * velocity[0] + step * forces[node.id][0]
+                velocity[1] = self.damping * velocity[1] + step * forces[node.id][1]
                 
-                positions[node.id][0] += velocities[node.id][0]
-                positions[node.id][1] += velocities[node.id][1]
+                move_x, move_y = step * velocity[0], step * velocity[1]
+                if convergence is not None:
+                    # no node moves further than max_step
+                    distance = math.hypot(move_x, move_y)
+                    if distance > self.max_step:
+                        move_x *= self.max_step / distance
+                        move_y *= self.max_step / distance
+                    max_force = max(max_force, math.hypot(*forces[node.id]))
+                
+                old_x, old_y = positions[node.id]
+                positions[node.id][0] += move_x
+                positions[node.id][1] += move_y
                 
                 # Keep within bounds
                 positions[node.id][0] = max(50, min(SCREEN_X - 50, positions[node.id][0]))
                 positions[node.id][1] = max(50, min(SCREEN_Y - 50, positions[node.id][1]))
+                
+                # kinetic energy of the move that actually happened (walls stop nodes)
+                moved_x = positions[node.id][0] - old_x
+                moved_y = positions[node.id][1] - old_y
+                energy += 0.5 * (moved_x * moved_x + moved_y * moved_y)
+                max_displacement = max(max_displacement, math.hypot(moved_x, moved_y))
+            
+            self.iterations_used = iteration + 1
+            if self.iteration_callback is not None:
+                self.iteration_callback(iteration, energy, max_displacement)
+            
+            if convergence is None:
+                continue
+            
+            # a node can stand still for a step right after an overshoot, so it only
+            # counts as settled when the force on it would not move it far either
+            # (the geometric sum of damped pushes is force / (1 - damping))
+            would_move = max_force / (1 - self.damping) if self.damping < 1 else math.inf
+            force_energy = sum(fx * fx + fy * fy for fx, fy in forces.values())
+            if convergence.update(force_energy, max(max_displacement, would_move), SCREEN_X):
+                self.converged = True
+                break
+        
+        return {node_id: (float(pos[0]), float(pos[1])) for node_id, pos in positions.items()}
+    
+    def _forces(self, nodes: List[DisplayNode], positions: Dict[str, List[float]],
+                edges: List[Tuple[str, str]]) -> Dict[str, List[float]]:
+        forces = {node.id: [0.0, 0.0] for node in nodes}
+        
+        # Repulsive forces between all nodes
+        for i, node1 in enumerate(nodes):
+            for node2 in nodes[i+1:]:
+                dx = positions[node2.id][0] - positions[node1.id][0]
+                dy = positions[node2.id][1] - positions[node1.id][1]
+                distance = math.sqrt(dx*dx + dy*dy) + 0.1  # Avoid division by zero
+                
+                force = self.repulsion / (distance * distance)
+                fx = force * dx / distance
+                fy = force * dy / distance
+                
+                forces[node1.id][0] -= fx
+                forces[node1.id][1] -= fy
+                forces[node2.id][0] += fx
+                forces[node2.id][1] += fy
+        
+        # Attractive forces along edges
+        for parent_id, child_id in edges:
+            if parent_id in positions and child_id in positions:
+                dx = positions[child_id][0] - positions[parent_id][0]
+                dy = positions[child_id][1] - positions[parent_id][1]
+                
+                forces[parent_id][0] += self.attraction * dx
+                forces[parent_id][1] += self.attraction * dy
+                forces[child_id][0] -= self.attraction * dx
+                forces[child_id][1] -= self.attraction * dy
+        
+        return forces
+    
+    def _scale_to_rest_length(self, positions: Dict[str, List[float]], edges: List[Tuple[str, str]]):
+        """Scale around the centre so the average edge has the rest length"""
+        lengths = [math.dist(positions[parent_id], positions[child_id])
+                   for parent_id, child_id in edges
+                   if parent_id in positions and child_id in positions]
+        mean = sum(lengths) / len(lengths) if lengths else 0.0
+        if mean <= 0:
+            return
         
-        return {node_id: (float(pos[0]), float(pos[1])) for node_id, pos in positions.items()}
\ No newline at end of file
+        rest = self.rest_length
+        centre_x = sum(pos[0] for pos in positions.values()) / len(positions)
+        centre_y = sum(pos[1] for pos in positions.values()) / len(positions)
+        for pos in positions.values():
+            pos[0] = max(50, min(SCREEN_X - 50, centre_x + (pos[0] - centre_x) * rest / mean))
+            pos[1] = max(50, min(SCREEN_Y - 50, centre_y + (pos[1] - centre_y) * rest / mean))
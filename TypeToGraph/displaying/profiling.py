@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, Iterator, List, Optional
+import time
+import tracemalloc
+
+
+'''
+    Profiling hooks for GraphDisplayer
+
+    GraphDisplayer only touches a DisplayProfiler when one is passed in, so leaving
+    the hook unset costs a single `is None` check per stage.
+
+    Stages:
+        get_display_values -> adapter.to_display_nodes -> calculate_positions -> draw
+        (animated displays also record one `animate_frame` call per frame)
+
+    The callback runs once the figure is built, before plt.show(). Animation frames are
+    drawn later by the GUI event loop, so `animate_frame` keeps arriving in that display's
+    DisplayStats after the callback (and never arrives on Agg, which has no event loop).
+'''
+
+
+@dataclass
+class StageStats:
+    wall_time_s: float = 0.0
+    calls: int = 0
+    peak_bytes: Optional[int] = None  # only with trace_memory=True
+
+
+@dataclass
+class IterationStats:
+    iteration: int
+    energy: float
+    max_displacement: float
+
+
+@dataclass
+class DisplayStats:
+    tree_type: str = ""
+    layout_engine: str = ""
+    node_count: int = 0
+    edge_count: int = 0
+    stages: Dict[str, StageStats] = field(default_factory=dict)
+    iterations: List[IterationStats] = field(default_factory=list)
+    iterations_used: Optional[int] = None  # None for non-iterative engines
+    converged: Optional[bool] = None
+
+    @property
+    def total_time_s(self) -> float:
+        return sum(stage.wall_time_s for stage in self.stages.values())
+
+    def to_dict(self) -> Dict[str, Any]:
+        '''Plain dict, ready for json.dumps or a logging extra'''
+        result = asdict(self)
+        result['total_time_s'] = self.total_time_s
+        return result
+
+
+StatsCallback = Callable[[DisplayStats], None]
+
+
+class DisplayProfiler:
+    '''Collects a DisplayStats per display() call and hands it to `callback`'''
+
+    def __init__(self, callback: Optional[StatsCallback] = None, trace_memory: bool = False,
+                record_iterations: bool = True):
+        self.callback = callback
+        self.trace_memory = trace_memory
+        self.record_iterations = record_iterations
+        self.stats = DisplayStats()
+
+    def begin(self, tree_type: str, layout_engine: Any) -> DisplayStats:
+        self.stats = DisplayStats(tree_type=tree_type, layout_engine=type(layout_engine).__name__)
+        return self.stats
+
+    def finish(self) -> DisplayStats:
+        if self.callback is not None:
+            self.callback(self.stats)
+        return self.stats
+
+    @contextmanager
+    def stage(self, name: str, stats: Optional[DisplayStats] = None) -> Iterator[None]:
+        '''Times the block into `stats` (default: the current display's)'''
+        stats = stats if stats is not None else self.stats
+        stage = stats.stages.setdefault(name, StageStats())
+
+        started_tracing = False
+        if self.trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                started_tracing = True
+            if hasattr(tracemalloc, 'reset_peak'):
+                tracemalloc.reset_peak()
+            # python 3.8 has no reset_peak: when tracing was already on, the peak is the
+            # highest usage since tracing started rather than for this stage
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            stage.wall_time_s += time.perf_counter() - start
+            stage.calls += 1
+
+            if self.trace_memory:
+                _, peak = tracemalloc.get_traced_memory()
+                stage.peak_bytes = max(stage.peak_bytes or 0, peak)
+                if started_tracing:
+                    tracemalloc.stop()
+
+    def record_iteration(self, iteration: int, energy: float, max_displacement: float) -> None:
+        '''Matches layouts.IterationCallback'''
+        if self.record_iterations:
+            self.stats.iterations.append(IterationStats(iteration, energy, max_displacement))
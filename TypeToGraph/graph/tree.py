@@ -1,10 +1,18 @@
 from __future__ import annotations
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, is_dataclass
 from abc import ABC, abstractmethod
-from typing import Any, Union, TypeAlias, Optional, List, Set, Dict
+from typing import (
+    Any, Union, TypeAlias, Optional, List, Set, Dict, Tuple, Iterator,
+    ClassVar, Final, ForwardRef, Literal, Annotated, TypeVar,
+    get_args, get_origin, get_type_hints
+)
+from collections.abc import Mapping
 from datetime import datetime
 from enum import Enum
+import sys
+import types
 import uuid
+import weakref
 
 
 NodeValue: TypeAlias = Union[int, float, str]
@@ -66,8 +74,12 @@ class DateBasedNoteTree(BaseTree):
         self.date_hierarchy: Dict[str, Dict[str, List[str]]] = {}
         # Structure: {year: {month: [note_ids]}}
     
-    def add_note(self, title: str, content: str = "") -> Note:
+    def add_note(self, title: str, content: str = "", created_at: Optional[datetime] = None) -> Note:
         note = Note(title=title, content=content)
+        if created_at is not None:
+            # backdated notes (imports, synthetic archives)
+            note.created_at = created_at
+            note.modified_at = created_at
         self.notes[note.id] = note
         
         # Organize by date
@@ -141,7 +153,7 @@ class BinaryTree(BaseTree):
     
     def insert(self, value: Any) -> None:
         '''Public Insert Method'''
-        self.root = self._insert_recursive(self.root, value)
+        self.root = self._insert(self.root, value)
     
     def get_display_values(self) -> List[List[TreeNode]]:
         """
@@ -170,17 +182,310 @@ class BinaryTree(BaseTree):
         
         return result
     
-    def _insert_recursive(self, root: Optional[BSTNode], value: Any):
-        """Insert a value into the binary tree following binary search tree rules."""
+    def _insert(self, root: Optional[BSTNode], value: Any):
+        """
+        Insert a value into the binary tree following binary search tree rules.
+        Walks down in a loop, so degenerate (sorted input) trees are not limited by the recursion limit.
+        """
         if root is None:
             return BSTNode(value)
         
-        if root.value == value:
-            return root
+        node = root
+        while node.value != value:
+            if node.value < value:
+                if node.right is None:
+                    node.right = BSTNode(value)
+                    break
+                node = node.right
+            else:
+                if node.left is None:
+                    node.left = BSTNode(value)
+                    break
+                node = node.left
         
-        if root.value < value:
-            root.right = self._insert_recursive(root.right, value)
+        return root
+
+
+@dataclass(eq=False)
+class TypeNode(TreeNode):
+    """A class in a TypeGraphTree, value is its qualified name"""
+    kind: str = "class"  # class | dataclass | enum | builtin | external | forward
+    type: Any = None
+    # repr=False: the graph can be cyclic
+    references: List['TypeReference'] = field(default_factory=list, repr=False)
+    # display tree, filled in by TypeGraphTree.get_display_values
+    parent: Optional['TypeNode'] = field(default=None, repr=False)
+    index: int = -1
+
+    # identity, not TreeNode's value equality: two classes can share a __qualname__
+    __eq__ = object.__eq__
+    __hash__ = object.__hash__
+
+
+@dataclass(eq=False)
+class TypeReference:
+    source: TypeNode = field(repr=False)
+    target: TypeNode = field(repr=False)
+    field_name: str  # attribute name, empty for base classes
+    relation: str  # e.g. field, optional, list, dict_value, union, base
+
+
+_NONE_TYPE = type(None)
+_UNION_ORIGINS = tuple(t for t in (Union, getattr(types, 'UnionType', None)) if t is not None)
+_STDLIB_MODULES = frozenset(getattr(sys, 'stdlib_module_names', ())) | {'builtins', 'typing'}
+
+# node kinds that are shown but not walked into
+_LEAF_KINDS = frozenset({'enum', 'builtin', 'external', 'forward'})
+
+
+# class -> resolved hints, weakly keyed so walked classes can still be garbage collected
+_hints_cache: 'weakref.WeakKeyDictionary[type, Tuple[Tuple[str, Any], ...]]' = weakref.WeakKeyDictionary()
+
+
+def _resolved_hints(cls: type) -> Tuple[Tuple[str, Any], ...]:
+    """
+    get_type_hints is the slow part of introspection, so results are cached per class
+    and shared between trees. Only complete results are cached: a class walked before
+    a name it refers to exists gets resolved again by later trees.
+    """
+    try:
+        cached = _hints_cache.get(cls)
+    except TypeError:  # unhashable or not weak referenceable class
+        cached = None
+    if cached is not None:
+        return cached
+
+    try:
+        hints = tuple(get_type_hints(cls, include_extras=True).items())
+    except Exception:
+        # one unresolvable name makes get_type_hints fail, resolve what we can
+        return tuple(_annotations_fallback(cls).items())
+
+    try:
+        _hints_cache[cls] = hints
+    except TypeError:
+        pass
+    return hints
+
+
+def _annotations_fallback(cls: type) -> Dict[str, Any]:
+    """Field by field, so only the unresolvable fields stay ForwardRefs"""
+    hints: Dict[str, Any] = {}
+    for klass in reversed(cls.__mro__):
+        module = sys.modules.get(klass.__module__)
+        globalns = vars(module) if module else {}
+        localns = {klass.__name__: klass, **vars(klass)}
+        for name, annotation in klass.__dict__.get('__annotations__', {}).items():
+            # a one field class lets get_type_hints resolve nested refs like Sequence['C']
+            shim = type(klass.__name__, (), {'__annotations__': {name: annotation}})
+            try:
+                annotation = get_type_hints(shim, globalns, localns, include_extras=True)[name]
+            except Exception:
+                if isinstance(annotation, str):
+                    annotation = ForwardRef(annotation)
+            hints[name] = annotation
+    return hints
+
+
+def _referenced_types(annotation: Any, path: Tuple[str, ...] = ()) -> Iterator[Tuple[str, Any]]:
+    """Unwrap Optional/List/Dict/Union/... down to (relation, class or ForwardRef) pairs"""
+    if annotation is None or annotation is _NONE_TYPE or annotation is Any:
+        return
+    if isinstance(annotation, str):
+        annotation = ForwardRef(annotation)
+    if isinstance(annotation, ForwardRef):
+        yield '.'.join(path) or 'field', annotation
+        return
+    if isinstance(annotation, TypeVar):
+        if annotation.__bound__ is not None:
+            yield from _referenced_types(annotation.__bound__, path)
+        return
+
+    origin = get_origin(annotation)
+    args = get_args(annotation)
+
+    if origin is None:
+        if isinstance(annotation, type):
+            yield '.'.join(path) or 'field', annotation
+        return
+
+    if origin is Annotated or origin is ClassVar or origin is Final:
+        if args:
+            yield from _referenced_types(args[0], path)
+    elif origin is Literal:
+        return
+    elif origin in _UNION_ORIGINS:
+        members = [arg for arg in args if arg is not _NONE_TYPE]
+        relation = 'optional' if len(members) == 1 and len(args) == 2 else 'union'
+        for arg in members:
+            yield from _referenced_types(arg, path + (relation,))
+    elif isinstance(origin, type) and issubclass(origin, Mapping) and len(args) == 2:
+        yield from _referenced_types(args[0], path + (f"{origin.__name__}_key",))
+        yield from _referenced_types(args[1], path + (f"{origin.__name__}_value",))
+    elif isinstance(origin, type) and origin.__module__.split('.')[0] in _STDLIB_MODULES:
+        # list, set, tuple, type, deque, ... (Callable args are lists, skip those)
+        for arg in args:
+            if arg is not Ellipsis and not isinstance(arg, list):
+                yield from _referenced_types(arg, path + (origin.__name__.lower(),))
+    elif isinstance(origin, type):
+        # user generic, e.g. Box[Note]
+        yield '.'.join(path) or 'field', origin
+        for arg in args:
+            yield from _referenced_types(arg, path + ('param',))
+
+
+class TypeGraphTree(BaseTree):
+    """
+    Type reference graph built from class annotations.
+    Classes are nodes and annotated attributes are references; a class is only
+    introspected once however many other classes refer to it.
+    """
+
+    def __init__(self, *roots: type, include_builtins: bool = False, follow_bases: bool = True):
+        self.include_builtins = include_builtins
+        self.follow_bases = follow_bases
+        self.nodes: Dict[Any, TypeNode] = {}  # keyed by class (or "forward:<name>")
+        self.cycles: List[TypeReference] = []  # references that close a cycle
+
+        for root in roots:
+            self.add_type(root)
+
+    @classmethod
+    def from_module(cls, module: types.ModuleType, **kwargs) -> 'TypeGraphTree':
+        """Every class defined in `module`"""
+        classes = [obj for obj in vars(module).values()
+                if isinstance(obj, type) and obj.__module__ == module.__name__]
+        return cls(*classes, **kwargs)
+
+    def add_type(self, tp: Any) -> Optional[TypeNode]:
+        """Walk `tp` and everything it references (iterative DFS, cycles are recorded)"""
+        start, created = self._node_for(tp)
+        if start is None or not created:
+            return start
+
+        stack = [(start, self._references_of(start))]
+        on_path = {start}
+
+        while stack:
+            node, refs = stack[-1]
+            for field_name, relation, target in refs:
+                child, created = self._node_for(target)
+                if child is None:
+                    continue
+
+                ref = TypeReference(node, child, field_name, relation)
+                node.references.append(ref)
+
+                if created:
+                    stack.append((child, self._references_of(child)))
+                    on_path.add(child)
+                    break
+                if child in on_path:
+                    self.cycles.append(ref)
+            else:
+                stack.pop()
+                on_path.discard(node)
+
+        return start
+
+    def get_display_values(self) -> List[List[TypeNode]]:
+        """
+        Breadth first spanning tree: types nothing refers to come first and every other
+        type sits under the first type that reaches it. Types only reachable through a
+        cycle start their own tree.
+        """
+        if not self.nodes:
+            return []
+
+        nodes = list(self.nodes.values())
+        referenced = {ref.target for node in nodes for ref in node.references
+                    if ref.target is not node}
+
+        levels: List[List[TypeNode]] = []
+        visited: Set[TypeNode] = set()
+
+        def spread(roots: List[TypeNode]) -> None:
+            for root in roots:
+                visited.add(root)
+                root.parent = None
+
+            frontier = roots
+            depth = 0
+            while frontier:
+                if len(levels) <= depth:
+                    levels.append([])
+                next_frontier = []
+                for node in frontier:
+                    levels[depth].append(node)
+                    for ref in node.references:
+                        if ref.target not in visited:
+                            visited.add(ref.target)
+                            ref.target.parent = node
+                            next_frontier.append(ref.target)
+                frontier = next_frontier
+                depth += 1
+
+        spread([node for node in nodes if node not in referenced])
+        for node in nodes:
+            if node not in visited:
+                spread([node])
+
+        index = 0
+        for level in levels:
+            for node in level:
+                node.index = index
+                index += 1
+
+        return levels
+
+    def _node_for(self, tp: Any) -> Tuple[Optional[TypeNode], bool]:
+        """(node, created) - None for things that are not types or are filtered out"""
+        if isinstance(tp, ForwardRef):
+            key: Any = f"forward:{tp.__forward_arg__}"
+            if key not in self.nodes:
+                self.nodes[key] = TypeNode(tp.__forward_arg__, kind='forward', type=tp)
+                return self.nodes[key], True
+            return self.nodes[key], False
+
+        if not isinstance(tp, type):
+            return None, False
+        if tp.__module__ == 'builtins' and not self.include_builtins:
+            return None, False
+
+        if tp in self.nodes:
+            return self.nodes[tp], False
+
+        if tp.__module__ == 'builtins':
+            kind = 'builtin'
+        elif issubclass(tp, Enum):
+            kind = 'enum'
+        elif tp.__module__.split('.')[0] in _STDLIB_MODULES:
+            kind = 'external'
+        elif is_dataclass(tp):
+            kind = 'dataclass'
         else:
-            root.left = self._insert_recursive(root.left, value)
-        
-        return root
\ No newline at end of file
+            kind = 'class'
+
+        node = TypeNode(tp.__qualname__, kind=kind, type=tp)
+        self.nodes[tp] = node
+        return node, True
+
+    def _references_of(self, node: TypeNode) -> Iterator[Tuple[str, str, Any]]:
+        """(field name, relation, target) for every type `node` refers to"""
+        if node.kind in _LEAF_KINDS:
+            return
+
+        cls = node.type
+        own = cls.__dict__.get('__annotations__', {})
+
+        if self.follow_bases:
+            for base in cls.__bases__:
+                if base.__module__.split('.')[0] not in _STDLIB_MODULES:
+                    yield '', 'base', base
+
+        for name, annotation in _resolved_hints(cls):
+            # inherited fields belong to the base class node
+            if self.follow_bases and name not in own:
+                continue
+            for relation, target in _referenced_types(annotation):
+                yield name, relation, target
@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the package uses top level imports (`from graph.tree import ...`), same as running app.py
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
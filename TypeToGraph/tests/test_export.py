@@ -0,0 +1,130 @@
+import pytest
+
+from graph.tree import BinaryTree
+from displaying.adapter import BinaryTreeAdapter
+from displaying.layouts import HierarchicalLayoutEngine
+from displaying import export
+
+
+def small_layout():
+    tree = BinaryTree(3)
+    tree.insert(1)
+    tree.insert(5)
+    nodes = BinaryTreeAdapter().to_display_nodes(tree)
+    return nodes, HierarchicalLayoutEngine().calculate_positions(nodes)
+
+
+def test_pillow_rejects_video_before_rendering(tmp_path, monkeypatch):
+    monkeypatch.setattr(export, '_render_frame', lambda *args: pytest.fail("rendered a frame"))
+    nodes, positions = small_layout()
+
+    with pytest.raises(ValueError, match="Pillow can only write"):
+        export.export_animation(nodes, positions, str(tmp_path / 'out.mp4'), writer='pillow', workers=0)
+
+
+def test_small_exports_render_in_process():
+    assert export._default_workers(frame_count=20, node_count=7) == 0
+
+
+def test_serial_gif_export(tmp_path):
+    nodes, positions = small_layout()
+    filename = tmp_path / 'out.gif'
+
+    written = export.export_animation(nodes, positions, str(filename), total_frames=3,
+                                    writer='pillow', workers=0, figsize=(2, 2), dpi=40)
+
+    assert written == 3
+    assert filename.stat().st_size > 0
+
+
+def test_parallel_export_matches_serial(tmp_path):
+    from PIL import Image, ImageSequence
+
+    nodes, positions = small_layout()
+    options = dict(total_frames=6, writer='pillow', figsize=(2, 2), dpi=40)
+
+    export.export_animation(nodes, positions, str(tmp_path / 'serial.gif'), workers=0, **options)
+    written = export.export_animation(nodes, positions, str(tmp_path / 'parallel.gif'),
+                                    workers=2, buffer_size=2, **options)
+
+    def frames(name):
+        with Image.open(tmp_path / name) as image:
+            return [frame.convert('RGB').tobytes() for frame in ImageSequence.Iterator(image)]
+
+    assert written == 6
+    # same frames in the same order: workers got the drawing state and results were reordered
+    assert frames('parallel.gif') == frames('serial.gif')
+
+
+class _RecordingSink:
+    def __init__(self, started):
+        self.started = started
+        self.frames = []
+        self.ahead = []
+
+    def write(self, frame):
+        self.ahead.append(len(self.started) - len(self.frames))
+        self.frames.append(frame)
+
+    def close(self):
+        pass
+
+    def abort(self):
+        pass
+
+
+def _threaded(monkeypatch, render):
+    '''threads instead of spawned processes, so the test can patch _render_frame'''
+    from concurrent.futures import ThreadPoolExecutor
+
+    def executor(max_workers, mp_context, initializer, initargs):
+        initializer(*initargs)
+        return ThreadPoolExecutor(max_workers)
+
+    monkeypatch.setattr(export, 'ProcessPoolExecutor', executor)
+    monkeypatch.setattr(export, '_render_frame', render)
+
+
+def test_frames_in_flight_are_bounded(monkeypatch):
+    started = []
+    sink = _RecordingSink(started)
+
+    def render(frame, pos):
+        started.append(frame)
+        return 1, 1, bytes([frame])
+
+    _threaded(monkeypatch, render)
+    monkeypatch.setattr(export, '_open_sink', lambda *args: sink)
+    nodes, positions = small_layout()
+
+    export.export_animation(nodes, positions, 'unused.gif', total_frames=30,
+                            writer='pillow', workers=2, buffer_size=3)
+
+    assert [frame[2][0] for frame in sink.frames] == list(range(30))
+    assert max(sink.ahead) <= 3
+
+
+def test_failure_cancels_queued_frames(monkeypatch):
+    import threading
+    import time
+
+    rendered = []
+    lock = threading.Lock()
+
+    def render(frame, pos):
+        if frame == 0:
+            raise RuntimeError("broken frame")
+        time.sleep(0.05)
+        with lock:
+            rendered.append(frame)
+        return 1, 1, b'\0'
+
+    _threaded(monkeypatch, render)
+    nodes, positions = small_layout()
+
+    with pytest.raises(RuntimeError, match="broken frame"):
+        export.export_animation(nodes, positions, 'unused.gif', total_frames=40,
+                                writer='pillow', workers=2, buffer_size=10)
+
+    # only frames already running finish, the rest of the window is cancelled
+    assert len(rendered) <= 3
@@ -0,0 +1,120 @@
+import pytest
+
+from graph.tree import BinaryTree
+from benchmarks import generators
+from displaying.adapter import BinaryTreeAdapter
+from displaying.layouts import SpringLayoutEngine, ForceDirectedLayoutEngine
+
+
+def small_tree_nodes():
+    tree = BinaryTree(3)
+    tree.insert(1)
+    tree.insert(5)
+    return BinaryTreeAdapter().to_display_nodes(tree)
+
+
+def test_spring_stops_before_fixed_schedule():
+    engine = SpringLayoutEngine(seed=0)
+    positions = engine.calculate_positions(small_tree_nodes())
+
+    assert len(positions) == 3
+    assert engine.converged
+    assert engine.iterations_used < 50
+
+
+def test_force_directed_stops_before_fixed_schedule():
+    engine = ForceDirectedLayoutEngine()
+    engine.calculate_positions(small_tree_nodes())
+
+    assert engine.converged
+    assert engine.iterations_used < 100
+
+
+def binary_tree_nodes(values):
+    return BinaryTreeAdapter().to_display_nodes(generators.build_binary_tree(values))
+
+
+@pytest.mark.parametrize("values", [
+    generators.balanced_values(15),
+    generators.random_values(15, seed=0),
+    generators.random_values(15, seed=1),
+], ids=["balanced", "random0", "random1"])
+def test_force_directed_settles_15_nodes_within_old_cap(values):
+    engine = ForceDirectedLayoutEngine()
+    engine.calculate_positions(binary_tree_nodes(values))
+
+    assert engine.converged
+    assert engine.iterations_used < 100
+
+
+@pytest.mark.parametrize("values", [
+    generators.balanced_values(31),
+    generators.random_values(31, seed=0),
+    generators.balanced_values(63),
+    generators.random_values(63, seed=0),
+], ids=["balanced31", "random31", "balanced63", "random63"])
+def test_force_directed_settles_before_cap(values):
+    nodes = binary_tree_nodes(values)
+    engine = ForceDirectedLayoutEngine()
+    engine.calculate_positions(nodes)
+
+    cap = max(engine.iterations, engine.iterations_per_node * len(nodes))
+    assert engine.converged
+    assert engine.iterations_used < cap
+
+
+def test_fixed_schedule_runs_every_iteration():
+    nodes = small_tree_nodes()
+
+    spring = SpringLayoutEngine(seed=0, adaptive=False)
+    spring.calculate_positions(nodes)
+    assert spring.iterations_used == 50
+
+    force = ForceDirectedLayoutEngine(adaptive=False)
+    force.calculate_positions(nodes)
+    assert force.iterations_used == 100
+    assert not force.converged
+
+
+def test_iteration_limit_reports_not_converged():
+    engine = SpringLayoutEngine(seed=0, iterations=2)
+    engine.calculate_positions(small_tree_nodes())
+
+    assert engine.iterations_used == 2
+    assert not engine.converged
+
+
+def _networkx_spring(nodes, **kwargs):
+    '''What SpringLayoutEngine did before the port: networkx.spring_layout, scaled to the screen'''
+    import networkx as nx
+    from constants import SCREEN_X, SCREEN_Y
+
+    G = nx.Graph()
+    initial_pos = {}
+    for node in nodes:
+        G.add_node(node.id)
+        initial_pos[node.id] = ((node.x / SCREEN_X) * 2 - 1, (node.y / SCREEN_Y) * 2 - 1)
+        if node.parent_id:
+            G.add_edge(node.parent_id, node.id)
+
+    positions = nx.spring_layout(G, pos=initial_pos, **kwargs)
+    return {node_id: (max(50, min(SCREEN_X - 50, (x + 1) * SCREEN_X / 2)),
+                    max(50, min(SCREEN_Y - 50, (y + 1) * SCREEN_Y / 2)))
+            for node_id, (x, y) in positions.items()}
+
+
+@pytest.mark.parametrize("size", [2, 3, 15, 63, 200])
+@pytest.mark.parametrize("options", [dict(k=1, iterations=50), dict(k=0.3, iterations=20)])
+def test_fixed_schedule_matches_networkx(size, options):
+    nx = pytest.importorskip("networkx")
+    if tuple(int(part) for part in nx.__version__.split('.')[:2]) < (3, 5):
+        pytest.skip("networkx < 3.5 handles tiny forces differently (gh-8113)")
+
+    nodes = binary_tree_nodes(generators.random_values(size, seed=1))
+
+    expected = _networkx_spring(nodes, seed=0, **options)
+    actual = SpringLayoutEngine(seed=0, adaptive=False, **options).calculate_positions(nodes)
+
+    assert expected.keys() == actual.keys()
+    for node_id, (x, y) in expected.items():
+        assert actual[node_id] == pytest.approx((x, y), abs=1e-6)
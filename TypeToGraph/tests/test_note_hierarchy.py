@@ -0,0 +1,106 @@
+from datetime import datetime
+
+from graph.tree import DateBasedNoteTree
+from displaying.adapter import NoteHierarchyAdapter
+
+
+def build(tree):
+    return NoteHierarchyAdapter().build_hierarchy(tree)
+
+
+def parent_of(hierarchy, note):
+    '''label of the entry `note` hangs under'''
+    return hierarchy.labels[hierarchy.parents[hierarchy.data.index(note)]]
+
+
+def shown_notes(hierarchy, tree):
+    return [data for data in hierarchy.data if data in tree.notes.values()]
+
+
+def test_children_hang_under_their_parent():
+    tree = DateBasedNoteTree()
+    project = tree.add_note("Project", created_at=datetime(2024, 3, 1))
+    task = tree.add_note("Task", created_at=datetime(2024, 3, 2))
+    project.add_note_as_child(task)
+
+    hierarchy = build(tree)
+
+    assert hierarchy.labels[:3] == ['2024', '2024-03', 'Project']
+    assert parent_of(hierarchy, task) == 'Project'
+    assert hierarchy.depths[hierarchy.data.index(task)] == 3
+
+
+def test_child_from_another_month_leaves_no_empty_month():
+    tree = DateBasedNoteTree()
+    child = tree.add_note("January child", created_at=datetime(2024, 1, 15))
+    parent = tree.add_note("February parent", created_at=datetime(2024, 2, 1))
+    parent.add_note_as_child(child)
+
+    hierarchy = build(tree)
+
+    assert '2024-01' not in hierarchy.labels
+    assert parent_of(hierarchy, parent) == '2024-02'
+    assert parent_of(hierarchy, child) == 'February parent'
+
+
+def test_parent_cycle_shows_each_note_once():
+    tree = DateBasedNoteTree()
+    first = tree.add_note("First", created_at=datetime(2024, 5, 1))
+    second = tree.add_note("Second", created_at=datetime(2024, 5, 2))
+    first.add_note_as_child(second)
+    second.add_note_as_child(first)
+
+    hierarchy = build(tree)
+
+    assert sorted(note.title for note in shown_notes(hierarchy, tree)) == ['First', 'Second']
+    # one of them has to be the top, the other hangs under it
+    parents = {parent_of(hierarchy, first), parent_of(hierarchy, second)}
+    assert '2024-05' in parents
+
+
+def test_mismatched_parent_and_children_ids():
+    tree = DateBasedNoteTree()
+    parent = tree.add_note("Parent", created_at=datetime(2024, 6, 1))
+    other = tree.add_note("Other", created_at=datetime(2024, 6, 2))
+    claimed = tree.add_note("Claimed", created_at=datetime(2024, 6, 3))
+    orphan = tree.add_note("Orphan", created_at=datetime(2024, 6, 4))
+
+    # Parent lists Claimed, but Claimed says it belongs to Other (which does not list it)
+    parent.children_ids.append(claimed.id)
+    claimed.parent_id = other.id
+    # Orphan points at Parent without being in its children_ids
+    orphan.parent_id = parent.id
+
+    hierarchy = build(tree)
+
+    assert len(shown_notes(hierarchy, tree)) == 4
+    assert parent_of(hierarchy, claimed) == '2024-06'
+    assert parent_of(hierarchy, orphan) == '2024-06'
+
+
+def test_unbucketed_notes_get_their_own_month():
+    tree = DateBasedNoteTree()
+    tree.add_note("Bucketed", created_at=datetime(2024, 7, 1))
+    loose = tree.add_note("Loose", created_at=datetime(2023, 11, 5))
+    for months in tree.date_hierarchy.values():
+        for note_ids in months.values():
+            if loose.id in note_ids:
+                note_ids.remove(loose.id)
+
+    hierarchy = build(tree)
+
+    assert parent_of(hierarchy, loose) == '2023-11'
+    assert len(shown_notes(hierarchy, tree)) == 2
+
+
+def test_display_nodes_follow_the_hierarchy():
+    tree = DateBasedNoteTree()
+    project = tree.add_note("Project", created_at=datetime(2024, 3, 1))
+    project.add_note_as_child(tree.add_note("Task", created_at=datetime(2024, 3, 2)))
+
+    nodes = NoteHierarchyAdapter().to_display_nodes(tree)
+    by_id = {node.id: node for node in nodes}
+
+    assert [node.label for node in nodes] == ['2024', '2024-03', 'Project', 'Task']
+    assert by_id[nodes[3].parent_id].label == 'Project'
+    assert nodes[0].parent_id is None
@@ -0,0 +1,62 @@
+import matplotlib
+matplotlib.use("Agg")
+
+import matplotlib.pyplot as plt
+import pytest
+
+from graph.tree import BinaryTree, DateBasedNoteTree
+from displaying.display import GraphDisplayer
+from displaying.layouts import HierarchicalLayoutEngine
+from displaying.profiling import DisplayProfiler
+
+
+def small_tree():
+    tree = BinaryTree(3)
+    tree.insert(1)
+    tree.insert(5)
+    return tree
+
+
+@pytest.fixture(autouse=True)
+def close_figures():
+    yield
+    plt.close('all')
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_callback_gets_every_stage():
+    received = []
+    displayer = GraphDisplayer(HierarchicalLayoutEngine(), DisplayProfiler(callback=received.append))
+
+    displayer.display(small_tree(), 'BinaryTree', animate=False)
+
+    assert received == [displayer.last_stats]
+    assert set(received[0].stages) == {'get_display_values', 'to_display_nodes',
+                                        'calculate_positions', 'draw'}
+    assert received[0].node_count == 3
+
+
+def test_callback_runs_when_display_fails():
+    received = []
+    displayer = GraphDisplayer(HierarchicalLayoutEngine(), DisplayProfiler(callback=received.append))
+
+    with pytest.raises(ValueError):
+        displayer.display(DateBasedNoteTree(), animate=False)  # no nodes
+
+    assert len(received) == 1
+
+
+@pytest.mark.filterwarnings("ignore::UserWarning")
+def test_animation_frames_stay_with_their_display():
+    displayer = GraphDisplayer(HierarchicalLayoutEngine(), DisplayProfiler())
+
+    displayer.display(small_tree(), 'BinaryTree', animate=True)
+    first, first_fig = displayer.last_stats, displayer.fig
+    displayer.display(small_tree(), 'BinaryTree', animate=False)
+
+    # the first draw of the figure starts the animation and draws frame 0, as a GUI
+    # backend would do after display() has returned
+    first_fig.canvas.draw()
+
+    assert first.stages['animate_frame'].calls == 1
+    assert 'animate_frame' not in displayer.last_stats.stages
@@ -0,0 +1,39 @@
+from graph.tree import BinaryTree
+from benchmarks import generators, suite
+
+
+def test_insert_keeps_bst_rules():
+    tree = BinaryTree(3)
+    for value in (7, 2, 3, 12, 7, 4):
+        tree.insert(value)
+
+    assert tree.root.left.value == 2
+    assert tree.root.right.value == 7
+    assert tree.root.right.left.value == 4
+    assert tree.root.right.right.value == 12
+    assert [len([node for node in level if node is not None]) for level in tree.get_display_values()] == [1, 2, 2]
+
+
+def test_skewed_tree_deeper_than_recursion_limit():
+    tree = generators.build_binary_tree(generators.skewed_values(5000))
+
+    assert generators.tree_height(tree) == 4999
+
+
+def test_suite_skips_unbuildable_workloads():
+    results = suite.run_suite(sizes=[10**6], families=['skewed'], cases=suite.default_cases()[:1],
+                            repeat=1, measure_memory=False, log=lambda line: None)
+
+    assert [result.status for result in results] == ['skipped']
+    assert results[0].reason.startswith("building tree")
+
+
+def test_suite_runs_type_graph_cases():
+    cases = [case for case in suite.default_cases()
+            if case.name in ('tree.TypeGraphTree', 'tree.get_display_values', 'adapter.TypeGraphAdapter')]
+    results = suite.run_suite(sizes=[50], families=['models'], cases=cases,
+                            repeat=1, measure_memory=False, log=lambda line: None)
+
+    assert [(result.case, result.status) for result in results] == [
+        ('tree.TypeGraphTree', 'ok'), ('tree.get_display_values', 'ok'), ('adapter.TypeGraphAdapter', 'ok'),
+    ]
@@ -0,0 +1,102 @@
+from collections.abc import Sequence
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Union
+import sys
+import types
+
+from graph.tree import TypeGraphTree, TypeNode
+
+
+@dataclass
+class Tag:
+    name: str
+
+
+@dataclass
+class Comment:
+    text: str
+    reply: Optional['Comment'] = None  # cycle onto itself
+
+
+@dataclass
+class Note:
+    title: str
+    author: Optional['Author']
+    tags: List[Tag]
+    comments: Dict[str, Comment]
+    pinned: Union[Tag, Comment]
+
+
+@dataclass
+class Author:
+    name: str
+    notes: List[Note]  # closes Note -> Author -> Note
+
+
+class Broken:
+    related: Sequence['Tag']
+    missing: 'DoesNotExist'  # noqa: F821, makes get_type_hints fail for the whole class
+
+
+def references(tree, tp):
+    return {(ref.field_name, ref.relation, ref.target.value) for ref in tree.nodes[tp].references}
+
+
+def test_optional_list_dict_union():
+    tree = TypeGraphTree(Note)
+
+    assert references(tree, Note) == {
+        ('author', 'optional', 'Author'),
+        ('tags', 'list', 'Tag'),
+        ('comments', 'dict_value', 'Comment'),
+        ('pinned', 'union', 'Tag'),
+        ('pinned', 'union', 'Comment'),
+    }
+    assert tree.nodes[Note].kind == 'dataclass'
+
+
+def test_cycles_are_recorded():
+    tree = TypeGraphTree(Note)
+
+    cycles = {(ref.source.value, ref.target.value) for ref in tree.cycles}
+    assert ('Author', 'Note') in cycles
+    assert ('Comment', 'Comment') in cycles
+
+
+def test_display_values_are_a_spanning_tree():
+    tree = TypeGraphTree(Note)
+    levels = tree.get_display_values()
+
+    assert [node.value for node in levels[0]] == ['Note']
+    assert sum(len(level) for level in levels) == len(tree.nodes)
+
+
+def test_fallback_resolves_nested_forward_refs():
+    tree = TypeGraphTree(Broken)
+
+    # collections.abc generics are treated like the builtin containers
+    assert ('related', 'sequence', 'Tag') in references(tree, Broken)
+    assert tree.nodes[Tag].kind == 'dataclass'
+    assert tree.nodes['forward:DoesNotExist'].kind == 'forward'
+
+
+def test_names_defined_later_resolve_in_later_trees(monkeypatch):
+    module = types.ModuleType('late_types')
+    monkeypatch.setitem(sys.modules, module.__name__, module)
+    exec("from typing import Optional\nclass A:\n    b: Optional['B']\n", vars(module))
+
+    before = TypeGraphTree(module.A)
+    assert references(before, module.A) == {('b', 'optional', 'B')}
+    assert before.nodes['forward:B'].kind == 'forward'
+
+    exec("class B:\n    pass\n", vars(module))
+    after = TypeGraphTree(module.A)
+    assert after.nodes[module.B].kind == 'class'
+    assert 'forward:B' not in after.nodes
+
+
+def test_type_nodes_compare_by_identity():
+    first, second = TypeNode('Note', type=int), TypeNode('Note', type=str)
+
+    assert first != second
+    assert len({first, second, first}) == 2